@@ -3,9 +3,10 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 import pandas as pd
 import asyncio
+import hmac
 import logging
 from typing import Dict, List, Any
-from app.services.ghl_opportunity_updater_v2 import GHLOpportunityUpdaterV2
+from app.services.ghl_opportunity_updater_v2 import GHLOpportunityUpdaterV2, invalidate_pipelines_cache
 from app.config import settings
 import tempfile
 import os
@@ -89,6 +90,43 @@ async def test_v2_connection(data: dict):
             "message": f"Error testing connection: {str(e)}"
         })
 
+@router.post("/api/webhooks/ghl/pipeline-updated")
+async def ghl_pipeline_updated_webhook(request: Request, data: dict):
+    """Evict cached pipelines when GHL reports a pipeline or stage change"""
+    # The webhook is public, so only callers holding the configured shared secret may evict entries
+    provided_secret = request.headers.get('X-Webhook-Secret', '')
+    if not settings.ghl_webhook_secret or not hmac.compare_digest(
+        provided_secret.encode('utf-8'), settings.ghl_webhook_secret.encode('utf-8')
+    ):
+        logger.warning("Rejected pipeline-updated webhook with a missing or invalid secret")
+        return JSONResponse({
+            "success": False,
+            "message": "Invalid webhook secret"
+        }, status_code=401)
+
+    try:
+        location_id = data.get('locationId') or data.get('location_id')
+
+        if not location_id:
+            return JSONResponse({
+                "success": False,
+                "message": "locationId is required"
+            }, status_code=400)
+
+        await invalidate_pipelines_cache(location_id)
+
+        return JSONResponse({
+            "success": True,
+            "message": f"Pipeline cache invalidated for location {location_id}"
+        })
+
+    except Exception as e:
+        logger.error(f"Error invalidating pipeline cache: {str(e)}")
+        return JSONResponse({
+            "success": False,
+            "message": f"Error invalidating pipeline cache: {str(e)}"
+        }, status_code=500)
+
 @router.get("/bulk-update-pipeline-stage", response_class=HTMLResponse)
 async def bulk_update_pipeline_stage_page(request: Request):
     """Render the bulk update pipeline & stage page"""
@@ -28,6 +28,15 @@ class Settings(BaseSettings):
     opportunity_migration_test_limit: int = 5  # Limit for testing (0 = no limit)
     opportunity_migration_max_limit: int = 1000  # Maximum opportunities to process (safety limit)
 
+    # Master/child opportunity update settings
+    pipeline_cache_ttl: float = 300  # Seconds a fetched pipeline/stage mapping is reused
+    ghl_requests_per_minute: int = 600  # Per-API-key PUT ceiling (GHL v1 allows 100 requests per 10 seconds)
+    results_feather_copies: bool = False  # Also write Arrow Feather copies of result exports (needs pyarrow)
+
+    # Shared cache settings
+    redis_url: str = ""  # e.g. redis://localhost:6379/0; empty keeps caches in-process
+    ghl_webhook_secret: str = ""  # Required X-Webhook-Secret on GHL cache webhooks; empty rejects them
+
     @property
     def subaccounts_list(self):
         try:
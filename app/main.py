@@ -38,6 +38,7 @@ import json
 from app.services.master_copy_notes import master_copy_service
 from app.services.master_child_notes import MasterChildNotesService
 from app.services.lead_search import lead_search_service
+from app.services.master_child_opportunity_update import master_child_opportunity_service
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,11 @@ async def startup_event():
         # Don't crash the server if database loading fails
         logger.info("Continuing startup despite database loading error")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close long-lived HTTP clients held by services"""
+    await master_child_opportunity_service.close()
+
 # Configure templates and static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
@@ -1276,16 +1282,14 @@ async def master_child_match_contacts(
     try:
         service = MasterChildNotesService()
         
-        # Read file contents
+        # Read file contents; the service parses the raw UTF-8 bytes directly
         master_content = await masterFile.read()
         child_content = await childFile.read()
         
-        # Decode as UTF-8
-        master_csv = master_content.decode('utf-8')
-        child_csv = child_content.decode('utf-8')
-        
         # Process matching
-        results = await service.match_contacts(master_csv, child_csv)
+        results = await service.match_contacts(master_content, child_content)
+        if not results.get('success'):
+            raise ValueError(results.get('error', 'Contact matching failed'))
         
         return {
             "success": True,
@@ -1343,6 +1347,43 @@ async def master_child_transfer_notes(request_data: dict):
             "message": "Notes transfer failed to start"
         }, status_code=500)
 
+@app.post("/api/master-child-notes/match-and-transfer")
+async def master_child_match_and_transfer_notes(
+    masterFile: UploadFile = File(...),
+    childFile: UploadFile = File(...),
+    dry_run: bool = Form(False)
+):
+    """Match contacts and transfer notes in one pass, starting transfers as matches are found"""
+    try:
+        service = MasterChildNotesService()
+
+        master_content = await masterFile.read()
+        child_content = await childFile.read()
+
+        result = await service.process_notes_transfer(
+            service.match_contacts_stream(master_content, child_content), dry_run
+        )
+
+        if result['success']:
+            return {
+                "success": True,
+                "processing_id": result['processing_id'],
+                "message": f"Notes transfer started{' (DRY RUN MODE)' if dry_run else ''}"
+            }
+        else:
+            return JSONResponse({
+                "success": False,
+                "error": result['message'],
+                "message": "Notes transfer failed to start"
+            }, status_code=500)
+    except Exception as e:
+        logger.error(f"Master-child match and transfer error: {str(e)}")
+        return JSONResponse({
+            "success": False,
+            "error": str(e),
+            "message": "Notes transfer failed to start"
+        }, status_code=500)
+
 @app.get("/api/master-child-notes/progress/{processing_id}")
 async def get_master_child_progress(processing_id: str):
     """Get progress of notes transfer operation"""
@@ -1380,62 +1421,71 @@ async def download_master_child_matches(request_data: dict):
                 "message": "No data to download"
             }, status_code=400)
         
-        # Create CSV content
-        output = io.StringIO()
         fieldnames = [
             'Match Type', 'Match Score', 'Master Contact Name', 'Master Phone', 
             'Master Stage', 'Master Contact ID', 'Master Account ID',
             'Child Contact Name', 'Child Phone', 'Child Stage', 
             'Child Contact ID', 'Child Account ID'
         ]
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Write matched contacts
-        for match in matches:
-            master = match.get('master_contact', {})
-            child = match.get('child_contact', {})
-            
-            writer.writerow({
-                'Match Type': match.get('match_type', ''),
-                'Match Score': f"{(match.get('match_score', 0) * 100):.1f}%",
-                'Master Contact Name': master.get('Contact Name', ''),
-                'Master Phone': master.get('phone', ''),
-                'Master Stage': master.get('stage', ''),
-                'Master Contact ID': master.get('Contact ID', ''),
-                'Master Account ID': master.get('Account Id', ''),
-                'Child Contact Name': child.get('Contact Name', ''),
-                'Child Phone': child.get('phone', ''),
-                'Child Stage': child.get('stage', ''),
-                'Child Contact ID': child.get('Contact ID', ''),
-                'Child Account ID': child.get('Account Id', '')
-            })
-        
-        # Write unmatched contacts
-        for unmatched_item in unmatched:
-            master = unmatched_item.get('master_contact', {})
-            writer.writerow({
-                'Match Type': 'No Match',
-                'Match Score': '0%',
-                'Master Contact Name': master.get('Contact Name', ''),
-                'Master Phone': master.get('phone', ''),
-                'Master Stage': master.get('stage', ''),
-                'Master Contact ID': master.get('Contact ID', ''),
-                'Master Account ID': master.get('Account Id', ''),
-                'Child Contact Name': '',
-                'Child Phone': '',
-                'Child Stage': '',
-                'Child Contact ID': '',
-                'Child Account ID': ''
-            })
-        
-        # Create response
-        csv_content = output.getvalue()
-        output.close()
-        
+
+        def generate_csv(batch_size: int = 1000):
+            """Yield the CSV in chunks of batch_size rows instead of building it all in memory"""
+            output = io.StringIO()
+            writer = csv.DictWriter(output, fieldnames=fieldnames)
+            writer.writeheader()
+
+            def flush():
+                chunk = output.getvalue()
+                output.seek(0)
+                output.truncate()
+                return chunk
+
+            # Write matched contacts
+            for row_number, match in enumerate(matches, 1):
+                master = match.get('master_contact', {})
+                child = match.get('child_contact', {})
+
+                writer.writerow({
+                    'Match Type': match.get('match_type', ''),
+                    'Match Score': f"{(match.get('match_score', 0) * 100):.1f}%",
+                    'Master Contact Name': master.get('Contact Name', ''),
+                    'Master Phone': master.get('phone', ''),
+                    'Master Stage': master.get('stage', ''),
+                    'Master Contact ID': master.get('Contact ID', ''),
+                    'Master Account ID': master.get('Account Id', ''),
+                    'Child Contact Name': child.get('Contact Name', ''),
+                    'Child Phone': child.get('phone', ''),
+                    'Child Stage': child.get('stage', ''),
+                    'Child Contact ID': child.get('Contact ID', ''),
+                    'Child Account ID': child.get('Account Id', '')
+                })
+                if row_number % batch_size == 0:
+                    yield flush()
+
+            # Write unmatched contacts
+            for row_number, unmatched_item in enumerate(unmatched, 1):
+                master = unmatched_item.get('master_contact', {})
+                writer.writerow({
+                    'Match Type': 'No Match',
+                    'Match Score': '0%',
+                    'Master Contact Name': master.get('Contact Name', ''),
+                    'Master Phone': master.get('phone', ''),
+                    'Master Stage': master.get('stage', ''),
+                    'Master Contact ID': master.get('Contact ID', ''),
+                    'Master Account ID': master.get('Account Id', ''),
+                    'Child Contact Name': '',
+                    'Child Phone': '',
+                    'Child Stage': '',
+                    'Child Contact ID': '',
+                    'Child Account ID': ''
+                })
+                if row_number % batch_size == 0:
+                    yield flush()
+
+            yield flush()
+
         response = StreamingResponse(
-            io.StringIO(csv_content),
+            generate_csv(),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=master-child-matching-results-{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"}
         )
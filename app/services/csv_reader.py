@@ -0,0 +1,39 @@
+import csv
+import io
+from typing import Collection
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv  # multi-threaded Arrow CSV reader
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+def read_string_csv(data: bytes, columns: Collection[str]) -> pd.DataFrame:
+    """Parse the given columns of UTF-8 CSV bytes as strings with empty cells kept as '',
+    using the Arrow reader when pyarrow is installed"""
+    # Both engines drop a UTF-8 BOM from the first column name, so the header lookup does too
+    first_line = data.partition(b'\n')[0].rstrip(b'\r').decode('utf-8-sig')
+    header = next(csv.reader([first_line]), [])
+    usecols = [column for column in header if column in columns]
+    # Everything is read as text: inferred numbers would turn phone 7075675820 into '7075675820.0'
+    # (and drop leading zeros), so Arrow gets explicit string column types rather than pandas' dtype=str
+    if CSV_ENGINE == 'pyarrow' and usecols:
+        convert_options = pacsv.ConvertOptions(
+            include_columns=usecols,
+            column_types={column: pa.string() for column in usecols},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False
+        )
+        try:
+            return pacsv.read_csv(pa.BufferReader(data), convert_options=convert_options).to_pandas()
+        except pa.ArrowInvalid:
+            # Arrow rejects ragged rows (its invalid_row_handler can only skip them), while the
+            # C engine pads short rows with '', so such exports are re-read with pandas
+            pass
+    return pd.read_csv(
+        io.BytesIO(data), encoding='utf-8', dtype=str, keep_default_na=False, na_filter=False, usecols=usecols or None
+    )
@@ -1,9 +1,17 @@
 import httpx
 import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import time
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
 from app.config import settings
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis is optional; fall back to the in-process cache
+    aioredis = None
+
 # Logging configuration: print to console and file
 logging.basicConfig(
     level=logging.INFO,
@@ -16,6 +24,43 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Pipelines rarely change, so share them across updater instances for
+# settings.pipeline_cache_ttl seconds. Entries are scoped to the access token that
+# fetched them (location -> token digest -> entry), so a cache hit is only served to
+# a token GHL has already accepted for that location
+_shared_pipelines_cache: Dict[str, Dict[str, Tuple[float, List[Dict[str, Any]]]]] = {}
+_redis_client = None
+
+
+def _pipelines_cache_key(location_id: str, token_digest: str = '*') -> str:
+    """Redis key of a location's shared pipelines entry for one access token ('*' matches every token)"""
+    return f"ghl:pipelines:{location_id}:{token_digest}"
+
+
+def _get_redis():
+    """Return a shared Redis client when REDIS_URL is configured, else None"""
+    global _redis_client
+    if _redis_client is None and aioredis is not None and settings.redis_url:
+        _redis_client = aioredis.from_url(settings.redis_url)
+    return _redis_client
+
+
+async def invalidate_pipelines_cache(location_id: str):
+    """Evict cached pipelines for a location after they change in GHL"""
+    _shared_pipelines_cache.pop(location_id, None)
+
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            keys = [key async for key in redis.scan_iter(match=_pipelines_cache_key(location_id))]
+            if keys:
+                await redis.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis pipeline cache delete failed: {str(e)}")
+
+    logger.info(f"Invalidated cached pipelines for location {location_id}")
+
+
 class GHLOpportunityUpdaterV2:
     def __init__(self, access_token: str, location_id: str = None):
         self.base_url = "https://services.leadconnectorhq.com"
@@ -28,11 +73,62 @@ class GHLOpportunityUpdaterV2:
         }
         self.client = httpx.AsyncClient(headers=self.headers, timeout=30)
         self._pipelines_cache: Optional[List[Dict[str, Any]]] = None
+        # Shared cache entries are keyed by a digest, never the token itself
+        self._token_digest = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+
+    async def _get_shared_pipelines(self) -> Optional[List[Dict[str, Any]]]:
+        """Look up pipelines cached by another instance (in-process first, then Redis)"""
+        if not self.location_id:
+            return None
+
+        cached = _shared_pipelines_cache.get(self.location_id, {}).get(self._token_digest)
+        if cached and time.monotonic() - cached[0] < settings.pipeline_cache_ttl:
+            return cached[1]
+
+        redis = _get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(_pipelines_cache_key(self.location_id, self._token_digest))
+                if raw:
+                    pipelines = orjson.loads(raw)
+                    _shared_pipelines_cache.setdefault(self.location_id, {})[self._token_digest] = (time.monotonic(), pipelines)
+                    return pipelines
+            except Exception as e:
+                logger.warning(f"Redis pipeline cache read failed: {str(e)}")
+        return None
+
+    async def _set_shared_pipelines(self, pipelines: List[Dict[str, Any]]):
+        """Publish freshly fetched pipelines to the shared caches"""
+        if not self.location_id or not pipelines:
+            return
+
+        _shared_pipelines_cache.setdefault(self.location_id, {})[self._token_digest] = (time.monotonic(), pipelines)
+
+        redis = _get_redis()
+        if redis is not None:
+            try:
+                # SETEX only takes whole seconds
+                ttl = max(1, int(settings.pipeline_cache_ttl))
+                await redis.setex(_pipelines_cache_key(self.location_id, self._token_digest), ttl, orjson.dumps(pipelines))
+            except Exception as e:
+                logger.warning(f"Redis pipeline cache write failed: {str(e)}")
+
+    async def invalidate_pipelines(self):
+        """Drop this instance's pipelines and the shared cache entry for its location"""
+        self._pipelines_cache = None
+        if self.location_id:
+            await invalidate_pipelines_cache(self.location_id)
 
     async def get_pipelines(self) -> List[Dict[str, Any]]:
         """Fetch all pipelines for the current access token and cache them."""
         if self._pipelines_cache is not None:
             return self._pipelines_cache
+
+        shared = await self._get_shared_pipelines()
+        if shared is not None:
+            logger.info(f"Using cached pipelines for location {self.location_id}")
+            self._pipelines_cache = shared
+            return shared
             
         try:
             # For GHL V2 API, pipelines require locationId as query parameter
@@ -51,11 +147,13 @@ class GHLOpportunityUpdaterV2:
             
             response = await self.client.get(url, params=params)
             
+            # Read the body once and reuse it for logging and parsing
+            body = response.content
             logger.info(f"Pipeline API Response Status: {response.status_code}")
-            logger.info(f"Pipeline API Response: {response.text}")
+            logger.info(f"Pipeline API Response: {body.decode('utf-8', 'replace')}")
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(body)
             
             # Handle different response structures
             if "pipelines" in data:
@@ -67,6 +165,7 @@ class GHLOpportunityUpdaterV2:
                 pipelines = []
             
             self._pipelines_cache = pipelines
+            await self._set_shared_pipelines(pipelines)
             
             logger.info(f"Fetched {len(pipelines)} pipelines")
             for p in pipelines:
@@ -90,24 +189,36 @@ class GHLOpportunityUpdaterV2:
                 }
             
             pipelines_url = f"{self.base_url}/opportunities/pipelines"
+            endpoint = f"{pipelines_url}?locationId={self.location_id}"
+            
+            # This token already fetched pipelines successfully, no need to probe again
+            if self._pipelines_cache is not None:
+                return {
+                    "status": "success",
+                    "endpoint": endpoint,
+                    "message": f"Connection successful - Found {len(self._pipelines_cache)} pipelines"
+                }
+            
             params = {"locationId": self.location_id}
             
             logger.info(f"Testing endpoint: {pipelines_url}")
             logger.info(f"Query params: {params}")
             
             response = await self.client.get(pipelines_url, params=params)
+            body = response.content
             logger.info(f"Test response status: {response.status_code}")
-            logger.info(f"Test response: {response.text[:500]}...")
+            logger.info(f"Test response: {body[:500].decode('utf-8', 'replace')}...")
             
             if response.status_code == 200:
-                # Try to parse pipelines
-                data = response.json()
-                pipelines = data.get("pipelines", data if isinstance(data, list) else [])
+                # Keep the parsed pipelines so a following get_pipelines() doesn't refetch them
+                data = orjson.loads(body)
+                pipelines = data.get("pipelines", []) if isinstance(data, dict) else data
+                self._pipelines_cache = pipelines
+                await self._set_shared_pipelines(pipelines)
                 return {
                     "status": "success",
-                    "endpoint": f"{pipelines_url}?locationId={self.location_id}",
-                    "message": f"Connection successful - Found {len(pipelines)} pipelines",
-                    "pipelines": [{"id": p.get("id"), "name": p.get("name"), "stages": len(p.get("stages", []))} for p in pipelines[:5]]  # Return first 5 for preview
+                    "endpoint": endpoint,
+                    "message": f"Connection successful - Found {len(pipelines)} pipelines"
                 }
             elif response.status_code == 401:
                 return {
@@ -132,7 +243,7 @@ class GHLOpportunityUpdaterV2:
                     "status": "error",
                     "endpoint": pipelines_url,
                     "message": f"Unexpected status code: {response.status_code}",
-                    "response": response.text[:200]
+                    "response": body[:200].decode('utf-8', 'replace')
                 }
             
         except Exception as e:
@@ -178,26 +289,28 @@ class GHLOpportunityUpdaterV2:
         logger.info(f"Headers: {dict(self.headers)}")
         
         try:
-            response = await self.client.put(url, json=payload)
+            response = await self.client.put(url, content=orjson.dumps(payload))
+            body = response.content
+            text = body.decode('utf-8', 'replace')
             logger.info(f"API Response Status: {response.status_code}")
             logger.info(f"API Response Headers: {dict(response.headers)}")
-            logger.info(f"API Response Body: {response.text}")
+            logger.info(f"API Response Body: {text}")
             
             # Handle the duplicate opportunity error specifically
-            if response.status_code == 400 and "duplicate opportunity" in response.text.lower():
+            if response.status_code == 400 and "duplicate opportunity" in text.lower():
                 logger.warning(f"Duplicate opportunity error for {opportunity_id}. This might happen when moving between pipelines.")
                 
                 # Try with a modified name to avoid conflicts
                 modified_payload = payload.copy()
-                import time
                 timestamp = int(time.time())
                 original_name = modified_payload.get("name", "Opportunity")
                 modified_payload["name"] = f"{original_name} - Updated {timestamp}"
                 
                 logger.info(f"Retrying with modified name: {modified_payload['name']}")
-                response = await self.client.put(url, json=modified_payload)
+                response = await self.client.put(url, content=orjson.dumps(modified_payload))
+                body = response.content
                 logger.info(f"Retry Response Status: {response.status_code}")
-                logger.info(f"Retry Response Body: {response.text}")
+                logger.info(f"Retry Response Body: {body.decode('utf-8', 'replace')}")
             
             response.raise_for_status()
             
@@ -206,7 +319,7 @@ class GHLOpportunityUpdaterV2:
                 "status": "success",
                 "opportunity_id": opportunity_id,
                 "response_status": response.status_code,
-                "response_data": response.json() if response.text else {}
+                "response_data": orjson.loads(body) if body else {}
             }
             
         except httpx.HTTPStatusError as e:
@@ -247,7 +360,7 @@ class GHLOpportunityUpdaterV2:
         logger.info(f"Payload: {payload}")
         
         try:
-            response = await self.client.post(url, json=payload)
+            response = await self.client.post(url, content=orjson.dumps(payload))
             logger.info(f"Notes API Response Status: {response.status_code}")
             logger.info(f"Notes API Response: {response.text}")
             
@@ -259,7 +372,7 @@ class GHLOpportunityUpdaterV2:
                 "contact_id": contact_id,
                 "notes": notes.strip(),
                 "response_status": response.status_code,
-                "response_data": response.json() if response.text else {}
+                "response_data": orjson.loads(response.content) if response.content else {}
             }
         except httpx.HTTPStatusError as e:
             error_msg = f"Failed to create notes for contact {contact_id}: Status {e.response.status_code}, Response: {e.response.text}"
@@ -3,6 +3,7 @@ Lead Search Service with Fuzzy Name Matching
 Searches leads by name with intelligent matching algorithms
 """
 
+import functools
 import pandas as pd
 import re
 from typing import List, Dict, Any, Optional, Tuple
@@ -12,6 +13,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    """Normalize name for better matching (cached, names repeat across searches)"""
+    if not name:
+        return ""
+    
+    # Remove extra spaces, convert to lowercase
+    name = re.sub(r'\s+', ' ', name.strip().lower())
+    
+    # Remove common prefixes/suffixes
+    name = re.sub(r'\b(mr|mrs|ms|dr|prof|sr|jr|i{1,3})\b\.?', '', name)
+    
+    # Remove special characters except spaces and hyphens
+    name = re.sub(r'[^\w\s\-]', '', name)
+    
+    return name.strip()
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_name_parts(name: str) -> Tuple[str, ...]:
+    """Split name into parts for better matching (cached)"""
+    return tuple(part for part in _normalize_name(name).split() if len(part) > 1)
+
+
 class LeadSearchService:
     def __init__(self):
         self.df: Optional[pd.DataFrame] = None
@@ -36,25 +62,11 @@ class LeadSearchService:
     
     def normalize_name(self, name: str) -> str:
         """Normalize name for better matching"""
-        if not name:
-            return ""
-        
-        # Remove extra spaces, convert to lowercase
-        name = re.sub(r'\s+', ' ', name.strip().lower())
-        
-        # Remove common prefixes/suffixes
-        name = re.sub(r'\b(mr|mrs|ms|dr|prof|sr|jr|i{1,3})\b\.?', '', name)
-        
-        # Remove special characters except spaces and hyphens
-        name = re.sub(r'[^\w\s\-]', '', name)
-        
-        return name.strip()
+        return _normalize_name(name)
     
     def split_name_parts(self, name: str) -> List[str]:
         """Split name into parts for better matching"""
-        normalized = self.normalize_name(name)
-        parts = [part for part in normalized.split() if len(part) > 1]
-        return parts
+        return list(_split_name_parts(name))
     
     def calculate_name_similarity(self, search_name: str, lead_name: str) -> Tuple[int, Dict[str, int]]:
         """Calculate similarity score between search name and lead name"""
@@ -1,21 +1,108 @@
 import asyncio
 import csv
+import functools
 import io
 import json
-import math
 import os
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 import logging
+import numpy as np
+import orjson
 import pandas as pd
 import httpx
 from app.config import settings
-from fuzzywuzzy import fuzz
+from app.services.csv_reader import read_string_csv
+from rapidfuzz import fuzz, process
 import re
 
 logger = logging.getLogger(__name__)
 
+_NON_DIGIT_RE = re.compile(r'\D')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# Notes posted in parallel per master contact, and retries when the API answers 429
+NOTE_TRANSFER_CONCURRENCY = 8
+NOTE_TRANSFER_MAX_RETRIES = 3
+# Contact pairs transferred in parallel by process_notes_transfer
+NOTE_TRANSFER_WORKERS = 4
+
+# Integer phone key for contacts without a phone number
+NO_PHONE = -1
+
+# CSV columns used for matching, transfer and export; everything else is skipped when parsing
+CONTACT_COLUMNS = frozenset({'Contact Name', 'phone', 'Opportunity Name', 'stage', 'Contact ID', 'Account Id'})
+
+# Column headers of the matches CSV export
+MATCHED_FIELDS = [
+    'Match_Type', 'Match_Score', 'Master_Contact_Name', 'Master_Phone', 'Master_Stage',
+    'Master_Contact_ID', 'Master_Account_ID', 'Child_Contact_Name', 'Child_Phone',
+    'Child_Stage', 'Child_Contact_ID', 'Child_Account_ID', 'Potential_Matches_Count'
+]
+UNMATCHED_FIELDS = [
+    'Master_Contact_Name', 'Master_Phone', 'Master_Stage',
+    'Master_Contact_ID', 'Master_Account_ID', 'Reason'
+]
+
+# Completed contact pairs between progress rate/ETA refreshes
+PROGRESS_UPDATE_INTERVAL = 10
+
+# Name comparisons in one cdist call above which all CPU cores are used
+CDIST_PARALLEL_MIN_PAIRS = 10_000
+
+
+def _notes_client(timeout: float = 5.0) -> httpx.AsyncClient:
+    """Shared-connection HTTP/2 client for the notes API"""
+    # Pool settings live on the transport, which also retries failed connection attempts
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        retries=2
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+@functools.lru_cache(maxsize=1024)
+def _auth_headers(api_key: str) -> Dict[str, str]:
+    """Request headers for a subaccount API key, built once per key"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+@functools.lru_cache(maxsize=200_000)
+def _normalize_phone(phone_str: str) -> str:
+    """Normalize a phone string to its last 10 digits (cached, the same values recur across CSVs)"""
+    # Remove decimal if present
+    if phone_str.endswith('.0'):
+        phone_str = phone_str[:-2]
+    # Remove all non-digit characters
+    digits_only = _NON_DIGIT_RE.sub('', phone_str)
+    # Remove leading country code (1) if present
+    if digits_only.startswith('1') and len(digits_only) == 11:
+        digits_only = digits_only[1:]
+    # Always return last 10 digits
+    if len(digits_only) >= 10:
+        return digits_only[-10:]
+    # Pad with leading zeros if less than 10 digits
+    return digits_only.zfill(10)
+
+
+@functools.lru_cache(maxsize=200_000)
+def _normalize_name(name: str) -> str:
+    """Lowercase a name, strip special characters and collapse whitespace (cached)"""
+    normalized = _NON_WORD_RE.sub('', name.lower())
+    return ' '.join(normalized.split())
+
+
+def _weighted_score(phone_eq: bool, name_ratio: int, stage_eq: bool) -> int:
+    """Phone 60%, name 30%, stage 10% on a 0-1000 integer scale (bounded by construction, no clamping needed)"""
+    return phone_eq * 600 + name_ratio * 3 + stage_eq * 100
+
+
 class MasterChildNotesService:
     def __init__(self):
         self.base_dir = os.path.join(os.getcwd(), "master_child_data")
@@ -33,29 +120,52 @@ class MasterChildNotesService:
         """Normalize phone number for comparison"""
         if not phone:
             return ""
-        # Convert to string and remove decimal if present
-        phone_str = str(phone)
-        if phone_str.endswith('.0'):
-            phone_str = phone_str[:-2]
-        # Remove all non-digit characters
-        digits_only = re.sub(r'\D', '', phone_str)
-        # Remove leading country code (1) if present
-        if digits_only.startswith('1') and len(digits_only) == 11:
-            digits_only = digits_only[1:]
-        # Always return last 10 digits
-        if len(digits_only) >= 10:
-            return digits_only[-10:]
-        # Pad with leading zeros if less than 10 digits
-        return digits_only.zfill(10)
-        # (Removed unreachable and mis-indented code. Logic is already handled above.)
+        return _normalize_phone(str(phone))
 
     def normalize_name(self, name: str) -> str:
         """Normalize name for comparison"""
         if not name:
             return ""
-        # Convert to lowercase, remove extra spaces, and special characters
-        normalized = re.sub(r'[^\w\s]', '', str(name).lower())
-        return ' '.join(normalized.split())
+        return _normalize_name(str(name))
+
+    @staticmethod
+    def _read_csv(content: Union[str, bytes]) -> pd.DataFrame:
+        """Parse the CONTACT_COLUMNS of CSV text or raw UTF-8 bytes as strings with empty cells kept as '',
+        using the Arrow reader when pyarrow is installed"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        return read_string_csv(data, CONTACT_COLUMNS)
+
+    @staticmethod
+    def _vectorize_normalize(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized normalize_phone (as int64, NO_PHONE when empty) / normalize_name over the phone, Contact Name and Opportunity Name columns"""
+        empty = pd.Series('', index=df.index, dtype=object)
+
+        def normalize_names(column: str) -> np.ndarray:
+            names = df[column].astype(str) if column in df.columns else empty
+            names = names.str.lower().str.replace(_NON_WORD_RE, '', regex=True).str.split().str.join(' ')
+            return names.to_numpy(dtype=object)
+
+        raw_phones = df['phone'].astype(str) if 'phone' in df.columns else empty
+        digits = raw_phones.str.replace(r'\.0$', '', regex=True).str.replace(_NON_DIGIT_RE, '', regex=True)
+        # Drop the leading country code, keep the last 10 digits and left-pad shorter numbers
+        has_country_code = (digits.str.len() == 11) & digits.str.startswith('1')
+        digits = digits.where(~has_country_code, digits.str[1:])
+        phones = digits.str[-10:].str.zfill(10).where(raw_phones != '', str(NO_PHONE))
+        # Normalized phones are always 10 digits, so they are keyed as integers (cheap to hash and compare)
+
+        return phones.astype(np.int64).to_numpy(), normalize_names('Contact Name'), normalize_names('Opportunity Name')
+
+    @staticmethod
+    def _name_similarity_matrix(names_a: np.ndarray, names_b: np.ndarray, score_cutoff: float = 0) -> np.ndarray:
+        """Pairwise fuzz.ratio (0-100) between two name lists, 0 where either name is empty or below score_cutoff"""
+        # Repeated names (common in real exports) are scored once and expanded back to full shape
+        unique_a, inverse_a = np.unique(names_a, return_inverse=True)
+        unique_b, inverse_b = np.unique(names_b, return_inverse=True)
+        # Phone buckets are usually tiny; only large ones are worth spreading across threads
+        workers = -1 if len(unique_a) * len(unique_b) >= CDIST_PARALLEL_MIN_PAIRS else 1
+        scores = process.cdist(unique_a, unique_b, scorer=fuzz.ratio, dtype=np.uint8, score_cutoff=score_cutoff, workers=workers)
+        scores[~np.outer(unique_a.astype(bool), unique_b.astype(bool))] = 0
+        return scores[np.ix_(inverse_a.ravel(), inverse_b.ravel())]
 
     def calculate_similarity_score(self, master_contact: Dict, child_contact: Dict) -> float:
         """Calculate similarity score between master and child contacts"""
@@ -70,36 +180,78 @@ class MasterChildNotesService:
         master_stage = str(master_contact.get('stage', '')).lower().strip()
         child_stage = str(child_contact.get('stage', '')).lower().strip()
         
-        # Calculate individual scores with NaN handling
-        try:
-            name_score = fuzz.ratio(master_name, child_name) / 100.0 if master_name and child_name else 0.0
-            # Handle potential NaN from fuzz.ratio
-            if math.isnan(name_score) or math.isinf(name_score):
-                name_score = 0.0
-        except (ValueError, ZeroDivisionError):
-            name_score = 0.0
-            
-        phone_score = 1.0 if master_phone and child_phone and master_phone == child_phone else 0.0
-        print(f"Comparing phones: master='{master_phone}' child='{child_phone}'")
-        stage_score = 1.0 if master_stage and child_stage and master_stage == child_stage else 0.0
-        
-        # Weighted scoring - phone is most important, then name, then stage
-        total_score = (phone_score * 0.6) + (name_score * 0.3) + (stage_score * 0.1)
-        
-        # Ensure score is valid and within bounds
-        if math.isnan(total_score) or math.isinf(total_score):
-            total_score = 0.0
-        
-        return max(0.0, min(1.0, total_score))
+        phone_eq = bool(master_phone and child_phone and master_phone == child_phone)
+        stage_eq = bool(master_stage and child_stage and master_stage == child_stage)
+
+        if not (master_name and child_name):
+            name_ratio = 0
+        elif master_name == child_name:
+            # Identical names score 100; skip fuzz.ratio on the common exact-match path
+            if phone_eq and stage_eq:
+                return 1.0
+            name_ratio = 100
+        else:
+            # fuzz.ratio is bounded to [0, 100] for any pair of strings
+            name_ratio = round(fuzz.ratio(master_name, child_name))
+
+        return _weighted_score(phone_eq, name_ratio, stage_eq) / 1000.0
+
+    def _iter_bucket_matches(self, master_df: pd.DataFrame, child_df: pd.DataFrame) -> Iterator[Tuple[List[int], np.ndarray, np.ndarray]]:
+        """Yield (master row indices, best child row index, best score) for each phone bucket"""
+        # Normalize every column once; matching below works on these arrays and row indices only
+        master_phones, master_names, master_opp_names = self._vectorize_normalize(master_df)
+        child_phones, child_names, child_opp_names = self._vectorize_normalize(child_df)
+
+        # Phone carries 40% of the score and the two names at most 60%, so a pair can only
+        # reach the 0.7 match threshold when phones are equal. Block candidates by phone and
+        # score each phone bucket as a small master x child matrix.
+        child_phone_lookup = {}
+        for child_idx, phone in enumerate(child_phones.tolist()):
+            if phone != NO_PHONE:
+                child_phone_lookup.setdefault(phone, []).append(child_idx)
+
+        master_phone_lookup = {}
+        for master_idx, phone in enumerate(master_phones.tolist()):
+            if phone in child_phone_lookup:
+                master_phone_lookup.setdefault(phone, []).append(master_idx)
+
+        for phone, master_idxs in master_phone_lookup.items():
+            child_idxs = child_phone_lookup[phone]
+            name_mat = self._name_similarity_matrix(master_names[master_idxs], child_names[child_idxs])
+            # A pair needs name + opportunity ratios >= 100 to reach 0.7, so opportunity ratios below
+            # 100 - best name ratio can't produce a match; the cutoff lets rapidfuzz exit early on them
+            # (0.5 of slack keeps ratios that would round up to the bound).
+            opp_cutoff = max(0.0, 100 - int(name_mat.max()) - 0.5)
+            opp_mat = self._name_similarity_matrix(master_opp_names[master_idxs], child_opp_names[child_idxs], opp_cutoff)
+
+            # Weighted score: phone 40% (always matched here), contact name 30%, opportunity name 30%
+            score_mat = 0.4 + 0.3 * (name_mat / 100.0) + 0.3 * (opp_mat / 100.0)
+
+            # One argmax pass; the best scores are gathered from it rather than recomputed with max()
+            best_cols = score_mat.argmax(axis=1)
+            yield master_idxs, np.asarray(child_idxs)[best_cols], score_mat[np.arange(len(master_idxs)), best_cols]
+
+    @staticmethod
+    def _build_match(master_contact: Dict, child_contact: Dict, score: float) -> Dict[str, Any]:
+        """Match record shared by match_contacts and match_contacts_stream"""
+        return {
+            'master_contact': master_contact,
+            'child_contact': child_contact,
+            'match_score': score,
+            'match_type': 'exact' if score >= 0.85 else 'fuzzy',
+            'potential_matches_count': 1,
+            'master_contact_id': master_contact.get('Contact ID', ''),
+            'child_contact_id': child_contact.get('Contact ID', '')
+        }
 
-    async def match_contacts(self, master_csv_content: str, child_csv_content: str) -> Dict[str, Any]:
-        """Match contacts between master and child CSV files"""
+    async def match_contacts(self, master_csv_content: Union[str, bytes], child_csv_content: Union[str, bytes]) -> Dict[str, Any]:
+        """Match contacts between master and child CSV files (text or raw UTF-8 bytes)"""
         
         try:
             # Parse CSV files with error handling
             try:
-                master_df = pd.read_csv(io.StringIO(master_csv_content))
-                child_df = pd.read_csv(io.StringIO(child_csv_content))
+                master_df = self._read_csv(master_csv_content)
+                child_df = self._read_csv(child_csv_content)
             except Exception as e:
                 logger.error(f"CSV parsing error: {str(e)}")
                 return {
@@ -110,19 +262,16 @@ class MasterChildNotesService:
                     'summary': {}
                 }
 
-            # Fill NaN values to prevent issues
-            master_df = master_df.fillna('')
-            child_df = child_df.fillna('')
-
             logger.info(f"Master CSV: {len(master_df)} contacts")
             logger.info(f"Child CSV: {len(child_df)} contacts")
 
-            # Build phone lookup for child contacts
-            child_phone_lookup = {}
-            for child_idx, child_contact in child_df.iterrows():
-                norm_phone = self.normalize_phone(child_contact.get('phone', ''))
-                if norm_phone:
-                    child_phone_lookup.setdefault(norm_phone, []).append((child_idx, child_contact))
+            if logger.isEnabledFor(logging.DEBUG):
+                for label, df in (('Master', master_df), ('Child', child_df)):
+                    sample = df.head(3)
+                    names = sample['Contact Name'].to_numpy(copy=False) if 'Contact Name' in sample else [''] * len(sample)
+                    phones = sample['phone'].to_numpy(copy=False) if 'phone' in sample else [''] * len(sample)
+                    for i, (name, phone) in enumerate(zip(names, phones)):
+                        logger.debug("%s #%d: Name='%s', Phone='%s'", label, i + 1, name, phone)
 
             matches = []
             unmatched_master = []
@@ -135,133 +284,32 @@ class MasterChildNotesService:
                 'multiple_matches': 0
             }
 
-            # For each master contact, find best matching child contact
-            for master_idx, master_contact in master_df.iterrows():
-                best_match = None
-                best_score = 0.0
-                # Parse CSV files
-                try:
-                    master_df = pd.read_csv(io.StringIO(master_csv_content)).fillna('')
-                    child_df = pd.read_csv(io.StringIO(child_csv_content)).fillna('')
-                except Exception as e:
-                    logger.error(f"CSV parsing error: {e}")
-                    return {'success': False, 'error': str(e), 'matches': [], 'unmatched_master': [], 'summary': {}}
-
-                print("Sample master contact:", master_df.iloc[0].to_dict() if len(master_df) > 0 else "None")
-                print("Sample child contact:", child_df.iloc[0].to_dict() if len(child_df) > 0 else "None")
-                print("--- Normalized master contacts (first 3) ---")
-                for i in range(min(3, len(master_df))):
-                    mc = master_df.iloc[i].to_dict()
-                    print(f"Master #{i+1}: Name='{self.normalize_name(mc.get('Contact Name', ''))}', Phone='{self.normalize_phone(mc.get('phone', ''))}'")
-                print("--- Normalized child contacts (first 3) ---")
-                for i in range(min(3, len(child_df))):
-                    cc = child_df.iloc[i].to_dict()
-                    print(f"Child #{i+1}: Name='{self.normalize_name(cc.get('Contact Name', ''))}', Phone='{self.normalize_phone(cc.get('phone', ''))}'")
-
-                # Build phone lookup for child contacts
-                child_phone_lookup = {}
-                for child_idx, child_contact in child_df.iterrows():
-                    norm_phone = self.normalize_phone(child_contact.get('phone', ''))
-                    if norm_phone:
-                        child_phone_lookup.setdefault(norm_phone, []).append(child_contact)
-
-                matches = []
-                unmatched_master = []
-                match_summary = {
-                    'total_master_contacts': len(master_df),
-                    'total_child_contacts': len(child_df),
-                    'exact_matches': 0,
-                    'fuzzy_matches': 0,
-                    'no_matches': 0,
-                    'multiple_matches': 0
-                }
+            master_records = master_df.to_dict('records')
 
-                # For each master contact, check all child contacts for best match
-                print("\n--- MATCHING DEBUG OUTPUT ---")
-                for master_idx, master_contact_row in master_df.iterrows():
-                    master_contact = master_contact_row.to_dict()
-                    norm_master_phone = self.normalize_phone(str(master_contact.get('phone', '')))
-                    norm_master_name = self.normalize_name(master_contact.get('Contact Name', ''))
-                    norm_master_opp_name = self.normalize_name(master_contact.get('Opportunity Name', ''))
-
-                    best_match = None
-                    best_score = 0.0
-                    match_type = 'none'
-                    potential_matches_count = 0
-                    best_candidate_info = None
-
-                    for child_idx, child_contact_row in child_df.iterrows():
-                        child_contact = child_contact_row.to_dict()
-                        norm_child_phone = self.normalize_phone(str(child_contact.get('phone', '')))
-                        norm_child_name = self.normalize_name(child_contact.get('Contact Name', ''))
-                        norm_child_opp_name = self.normalize_name(child_contact.get('Opportunity Name', ''))
-
-                        # Phone match (40% weight)
-                        phone_score = 0.0
-                        if norm_master_phone and norm_child_phone and norm_master_phone == norm_child_phone:
-                            phone_score = 1.0
-
-                        # Contact Name match (30% weight) - fuzzy matching
-                        contact_name_score = fuzz.ratio(norm_master_name, norm_child_name) / 100.0 if norm_master_name and norm_child_name else 0.0
-
-                        # Opportunity Name match (30% weight) - fuzzy matching
-                        opportunity_name_score = fuzz.ratio(norm_master_opp_name, norm_child_opp_name) / 100.0 if norm_master_opp_name and norm_child_opp_name else 0.0
-
-                        # Weighted score
-                        total_score = (phone_score * 0.4) + (contact_name_score * 0.3) + (opportunity_name_score * 0.3)
-
-                        if total_score > best_score:
-                            best_score = total_score
-                            best_match = child_contact
-                            potential_matches_count = 1
-                            best_candidate_info = {
-                                'child_name': child_contact.get('Contact Name', ''),
-                                'child_phone': child_contact.get('phone', ''),
-                                'child_opp_name': child_contact.get('Opportunity Name', ''),
-                                'score': total_score,
-                                'phone_score': phone_score,
-                                'contact_name_score': contact_name_score,
-                                'opportunity_name_score': opportunity_name_score
-                            }
-
-                    print(f"Master #{master_idx+1}: {master_contact.get('Contact Name', '')} | Best Score: {best_score:.3f}")
-                    if best_candidate_info:
-                        print(f"  Best Candidate: Name='{best_candidate_info['child_name']}', Phone='{best_candidate_info['child_phone']}', OppName='{best_candidate_info['child_opp_name']}'")
-                        print(f"    Score: {best_candidate_info['score']:.3f} (Phone: {best_candidate_info['phone_score']:.3f}, Name: {best_candidate_info['contact_name_score']:.3f}, OppName: {best_candidate_info['opportunity_name_score']:.3f})")
-                    else:
-                        print("  No candidate found.")
-                    if best_match and best_score >= 0.85:
-                        match_type = 'exact'
-                        match_summary['exact_matches'] += 1
-                    elif best_match and best_score >= 0.7:
-                        match_type = 'fuzzy'
-                        match_summary['fuzzy_matches'] += 1
-                    else:
-                        match_type = 'none'
-                        match_summary['no_matches'] += 1
-
-                    if best_match and match_type != 'none':
-                        matches.append({
-                            'master_contact': master_contact,
-                            'child_contact': best_match,
-                            'match_score': best_score,
-                            'match_type': match_type,
-                            'potential_matches_count': potential_matches_count,
-                            'master_contact_id': master_contact.get('Contact ID', ''),
-                            'child_contact_id': best_match.get('Contact ID', '')
-                        })
-                    else:
-                        unmatched_master.append({
-                            'master_contact': master_contact,
-                            'master_contact_id': master_contact.get('Contact ID', '')
-                        })
+            best_child_idx = np.zeros(len(master_records), dtype=int)
+            best_scores = np.zeros(len(master_records))
+            for master_idxs, bucket_child_idx, bucket_scores in self._iter_bucket_matches(master_df, child_df):
+                best_child_idx[master_idxs] = bucket_child_idx
+                best_scores[master_idxs] = bucket_scores
 
-                return {
-                    'success': True,
-                    'matches': matches,
-                    'unmatched_master': unmatched_master,
-                    'summary': match_summary
-                }
+            exact_mask = best_scores >= 0.85
+            fuzzy_mask = (best_scores >= 0.7) & ~exact_mask
+            match_summary['exact_matches'] = int(exact_mask.sum())
+            match_summary['fuzzy_matches'] = int(fuzzy_mask.sum())
+            match_summary['no_matches'] = len(master_records) - match_summary['exact_matches'] - match_summary['fuzzy_matches']
+
+            # Only the winning child rows are materialized as dicts
+            winner_idxs = np.unique(best_child_idx[exact_mask | fuzzy_mask])
+            child_winners = dict(zip(winner_idxs.tolist(), child_df.iloc[winner_idxs].to_dict('records')))
+
+            for master_idx, master_contact in enumerate(master_records):
+                if exact_mask[master_idx] or fuzzy_mask[master_idx]:
+                    matches.append(self._build_match(master_contact, child_winners[best_child_idx[master_idx]], float(best_scores[master_idx])))
+                else:
+                    unmatched_master.append({
+                        'master_contact': master_contact,
+                        'master_contact_id': master_contact.get('Contact ID', '')
+                    })
 
             return {
                 'success': True,
@@ -269,14 +317,7 @@ class MasterChildNotesService:
                 'unmatched_master': unmatched_master,
                 'summary': match_summary
             }
-            
-            return {
-                'success': True,
-                'matches': matches,
-                'unmatched_master': unmatched_master,
-                'summary': match_summary
-            }
-            
+
         except Exception as e:
             logger.error(f"Contact matching failed: {str(e)}")
             return {
@@ -287,27 +328,40 @@ class MasterChildNotesService:
                 'summary': {}
             }
 
-    async def process_notes_transfer(self, matches, dry_run=False, batch_size=10):
-                    # Debug output for API key selection
-                    print(f"  Child Account Id: {child_account_id}")
-                    print(f"  Child API Key: {child_api_key}")
-                    print(f"  Master Account Id: {master_account_id}")
-                    print(f"  Master API Key: {master_api_key}")
-    async def process_notes_transfer(self, matches, dry_run=False, batch_size=10):
-        """Process notes transfer from child contacts to master contacts"""
+    async def match_contacts_stream(self, master_csv_content: Union[str, bytes], child_csv_content: Union[str, bytes]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matches phone bucket by phone bucket, so transfer workers can start before matching finishes"""
+        master_df = self._read_csv(master_csv_content)
+        child_df = self._read_csv(child_csv_content)
+
+        for master_idxs, bucket_child_idx, bucket_scores in self._iter_bucket_matches(master_df, child_df):
+            for master_idx, child_idx, score in zip(master_idxs, bucket_child_idx.tolist(), bucket_scores.tolist()):
+                if score >= 0.7:
+                    master_contact = master_df.iloc[master_idx].to_dict()
+                    child_contact = child_df.iloc[child_idx].to_dict()
+                    yield self._build_match(master_contact, child_contact, score)
+            # Let consumers run between buckets
+            await asyncio.sleep(0)
+
+    async def process_notes_transfer(self, matches, dry_run=False, batch_size=10, concurrency=NOTE_TRANSFER_WORKERS):
+        """Process notes transfer from child contacts to master contacts
+
+        matches may be a list or an async iterable such as match_contacts_stream(); contact pairs
+        are fed through a queue to `concurrency` workers as they arrive.
+        """
         processing_id = str(uuid.uuid4())
         operation_start = datetime.now()
+        is_stream = hasattr(matches, '__aiter__')
 
-        # Analyze match types
-        exact_matches = [m for m in matches if m.get('match_type') == 'exact']
-        fuzzy_matches = [m for m in matches if m.get('match_type') == 'fuzzy']
+        # Analyze match types (a stream is counted as it is consumed)
+        exact_count = 0 if is_stream else sum(1 for m in matches if m.get('match_type') == 'exact')
+        fuzzy_count = 0 if is_stream else sum(1 for m in matches if m.get('match_type') == 'fuzzy')
 
-        logger.info(f"Processing notes transfer: {len(exact_matches)} exact matches, {len(fuzzy_matches)} fuzzy matches")
+        logger.info(f"Processing notes transfer: {exact_count} exact matches, {fuzzy_count} fuzzy matches")
 
         # Initialize progress tracking
         self.progress_tracker[processing_id] = {
             'status': 'initializing',
-            'total': len(matches),
+            'total': 0 if is_stream else len(matches),
             'completed': 0,
             'success_count': 0,
             'error_count': 0,
@@ -315,175 +369,168 @@ class MasterChildNotesService:
             'current_batch': 0,
             'recent_errors': [],
             'start_time': operation_start,
+            'start_monotonic': time.monotonic(),
             'eta': None,
             'rate': None,
-                'dry_run': False,
-            'exact_matches_count': len(exact_matches),
-            'fuzzy_matches_count': len(fuzzy_matches),
-            'processing_summary': f"Processing {len(exact_matches)} exact + {len(fuzzy_matches)} fuzzy matches"
+            'dry_run': dry_run,
+            'exact_matches_count': exact_count,
+            'fuzzy_matches_count': fuzzy_count,
+            'processing_summary': f"Processing {exact_count} exact + {fuzzy_count} fuzzy matches"
         }
+        progress = self.progress_tracker[processing_id]
 
         try:
             # Prepare subaccount API keys
-            import os, json
             subaccounts = json.loads(os.environ.get('SUBACCOUNTS', '[]'))
             account_api_keys = {str(s['id']): s['api_key'] for s in subaccounts if s.get('api_key')}
 
+            # Account ids repeat heavily, so each (child, master) account pair's API keys are looked up once
+            pair_api_keys: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]] = {}
+
+            def account_pair(match: Dict) -> Tuple[str, str]:
+                # Get Account Ids from CSV contact dicts, ensure string and strip whitespace
+                return (
+                    str(match.get('child_contact', {}).get('Account Id', '')).strip(),
+                    str(match.get('master_contact', {}).get('Account Id', '')).strip()
+                )
+
+            def resolve_api_keys(match: Dict) -> Tuple[Tuple[str, str], Tuple[Optional[str], Optional[str]]]:
+                accounts = account_pair(match)
+                api_keys = pair_api_keys.get(accounts)
+                if api_keys is None:
+                    api_keys = pair_api_keys[accounts] = (account_api_keys.get(accounts[0]), account_api_keys.get(accounts[1]))
+                return accounts, api_keys
+
+            if not is_stream:
+                # Group pairs sharing credentials so their requests run back to back
+                matches = sorted(matches, key=account_pair)
+
             # Production notes transfer: call actual API for each contact pair
-            import httpx
-            total = len(matches)
-            notes_transferred = 0
-            errors = 0
-            async with httpx.AsyncClient() as client:
-                print(f"Available account_api_keys: {list(account_api_keys.keys())}")
-                for idx, match in enumerate(matches):
-                    child_contact_id = match.get('child_contact_id')
-                    master_contact_id = match.get('master_contact_id')
-                    # Get Account Ids from CSV contact dicts, ensure string and strip whitespace
-                    child_account_id = str(match['child_contact'].get('Account Id', '')).strip()
-                    master_account_id = str(match['master_contact'].get('Account Id', '')).strip()
+            pairs_started = 0
+            queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+            # Per-pair outcomes are streamed to disk as ND-JSON instead of being accumulated in memory
+            pairs_file = os.path.join(self.results_dir, f"notes_transfer_{processing_id}_pairs.ndjson")
+
+            async def produce():
+                if is_stream:
+                    async for match in matches:
+                        progress['total'] += 1
+                        progress['exact_matches_count' if match.get('match_type') == 'exact' else 'fuzzy_matches_count'] += 1
+                        await queue.put(match)
+                else:
+                    for match in matches:
+                        await queue.put(match)
+                # One stop marker per worker; if producing fails the task group cancels the workers instead
+                for _ in range(concurrency):
+                    await queue.put(None)
+
+            def refresh_rate():
+                completed, total = progress['completed'], progress['total']
+                elapsed = time.monotonic() - progress['start_monotonic']
+                if elapsed > 0 and completed:
+                    progress['rate'] = f"{completed / elapsed * 60:.1f}"  # items per minute
+                    if completed < total:
+                        eta_seconds = (total - completed) / (completed / elapsed)
+                        if eta_seconds < 60:
+                            progress['eta'] = f"{eta_seconds:.0f} seconds"
+                        else:
+                            progress['eta'] = f"{eta_seconds/60:.1f} minutes"
+                    else:
+                        progress['eta'] = "Complete"
+                if len(progress['recent_errors']) > 10:
+                    progress['recent_errors'] = progress['recent_errors'][-10:]
+                logger.info(f"Progress: {completed}/{total} contacts processed, {progress['success_count']} successful, {progress['notes_transferred']} notes transferred")
+
+            async def transfer_pair(client, match, pairs_log):
+                nonlocal pairs_started
+                pairs_started += 1
+                contact_pair_number = pairs_started
+                child_contact_id = match.get('child_contact_id')
+                master_contact_id = match.get('master_contact_id')
+                transferred_count = 0
+                error = None
+                try:
+                    (child_account_id, master_account_id), (child_api_key, master_api_key) = resolve_api_keys(match)
                     match_type = match.get('match_type', 'unknown')
-                    child_api_key = account_api_keys.get(child_account_id)
-                    master_api_key = account_api_keys.get(master_account_id)
-                    print(f"  Child Account Id: '{child_account_id}'")
-                    print(f"  Child API Key: {child_api_key}")
-                    print(f"  Master Account Id: '{master_account_id}'")
-                    print(f"  Master API Key: {master_api_key}")
-                    print(f"[{idx+1}/{total}] Processing {match_type} match: {child_contact_id} -> {master_contact_id}")
-                    try:
-                        # Get notes from child contact
-                        child_notes = await self._get_contact_notes(client, child_contact_id, child_api_key)
-                        if not child_notes:
-                            print(f"No notes found for child contact {child_contact_id}")
-                            continue
+                    progress['status'] = f"processing_contact_{contact_pair_number}/{progress['total']}"
+                    if not all([child_contact_id, master_contact_id, child_api_key, master_api_key]):
+                        raise ValueError(f"Missing required data for contact pair {child_contact_id} -> {master_contact_id}")
+                    logger.debug("Processing %s match: %s -> %s (accounts %s -> %s)", match_type, child_contact_id, master_contact_id, child_account_id, master_account_id)
+                    # Get notes from child contact
+                    child_notes = await self._get_contact_notes(client, child_contact_id, child_api_key)
+                    if not child_notes:
+                        logger.debug("No notes found for child contact %s", child_contact_id)
+                    elif dry_run:
+                        transferred_count = len(child_notes)
+                        logger.debug("[DRY RUN] Would transfer %d notes from child %s to master %s", transferred_count, child_contact_id, master_contact_id)
+                    else:
                         # Transfer notes to master contact
                         transferred_count = await self._transfer_notes_to_master(client, master_contact_id, master_api_key, child_notes)
-                        notes_transferred += transferred_count
-                        print(f"Transferred {transferred_count} notes from child {child_contact_id} to master {master_contact_id}")
-                    except Exception as e:
-                        print(f"Error transferring notes for pair {child_contact_id} -> {master_contact_id}: {str(e)}")
-                        errors += 1
+                        logger.debug("Transferred %d notes from child %s to master %s", transferred_count, child_contact_id, master_contact_id)
+                    progress['notes_transferred'] += transferred_count
+                    progress['success_count'] += 1
+                except Exception as e:
+                    error = str(e)
+                    error_msg = f"[{contact_pair_number}/{progress['total']}] Error transferring notes for pair {child_contact_id} -> {master_contact_id}: {error}"
+                    progress['recent_errors'].append(error_msg)
+                    progress['error_count'] += 1
+                    logger.error(error_msg)
+                progress['completed'] += 1
+                pairs_log.write(orjson.dumps({
+                    'master_contact_id': master_contact_id,
+                    'child_contact_id': child_contact_id,
+                    'transferred': transferred_count,
+                    'error': error
+                }) + b'\n')
+                # Rate/ETA formatting and error trimming only run every PROGRESS_UPDATE_INTERVAL pairs
+                if progress['completed'] % PROGRESS_UPDATE_INTERVAL == 0:
+                    refresh_rate()
+
+            async def worker(client, pairs_log):
+                while True:
+                    match = await queue.get()
+                    if match is None:
+                        return
+                    await transfer_pair(client, match, pairs_log)
+
+            async with _notes_client() as client:
+                logger.info(f"Available account_api_keys: {list(account_api_keys.keys())}")
+                with open(pairs_file, 'wb') as pairs_log:
+                    # A failing task cancels the others, so none is left using the closed client or a full queue
+                    async with asyncio.TaskGroup() as tasks:
+                        tasks.create_task(produce())
+                        for _ in range(concurrency):
+                            tasks.create_task(worker(client, pairs_log))
+
+            refresh_rate()
+            progress['status'] = 'completed'
+            logger.info(f"Notes transfer completed: {progress['completed']} contacts processed, {progress['success_count']} successful, {progress['error_count']} errors, {progress['notes_transferred']} notes transferred")
+            await self._save_operation_results(processing_id, progress)
             return {
-                'success': errors == 0,
-                'message': f'Notes transfer completed. {notes_transferred} notes transferred, {errors} errors.',
+                'success': progress['error_count'] == 0,
+                'message': f"Notes transfer completed. {progress['notes_transferred']} notes transferred, {progress['error_count']} errors.",
                 'processing_id': processing_id,
                 'dry_run': dry_run,
-                'notes_transferred': notes_transferred,
-                'error_count': errors
+                'notes_transferred': progress['notes_transferred'],
+                'error_count': progress['error_count']
             }
         except Exception as e:
-            print(f"Notes transfer process failed: {str(e)}")
+            # Failures inside the task group arrive wrapped in an ExceptionGroup
+            while isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
+            logger.error(f"Notes transfer process failed: {str(e)}")
             return {
                 'success': False,
                 'message': f'Process failed: {str(e)}',
                 'processing_id': processing_id
             }
 
-    async def _process_notes_batches(
-        self, 
-        processing_id: str, 
-        matches: List[Dict], 
-        account_api_keys: Dict[str, str], 
-        batch_size: int,
-        dry_run: bool
-    ):
-        """Process notes transfer in batches"""
-        
-        progress = self.progress_tracker[processing_id]
-        total_matches = len(matches)
-        processed_contacts = 0
-        
-        logger.info(f"Starting notes transfer: {total_matches} contact pairs, batch size: {batch_size}, dry_run: {dry_run}")
-        
-
-        async def process_contact_pair(match, match_index, batch_start, client, account_api_keys, dry_run, total_matches, progress):
-            contact_pair_number = batch_start + match_index + 1
-            try:
-                child_contact_id = match.get('child_contact_id')
-                master_contact_id = match.get('master_contact_id')
-                child_account_id = str(match.get('child_account_id', ''))
-                master_account_id = str(match.get('master_account_id', ''))
-                match_type = match.get('match_type', 'unknown')
-                child_api_key = account_api_keys.get(child_account_id)
-                master_api_key = account_api_keys.get(master_account_id)
-                progress['status'] = f'processing_contact_{contact_pair_number}/{total_matches}'
-                if not all([child_contact_id, master_contact_id, child_api_key, master_api_key]):
-                    error_msg = f"Missing required data for contact pair {contact_pair_number}: {child_contact_id} -> {master_contact_id}"
-                    progress['recent_errors'].append(error_msg)
-                    progress['error_count'] += 1
-                    logger.error(error_msg)
-                    return 0, False
-                logger.info(f"[{contact_pair_number}/{total_matches}] Processing {match_type} match: {child_contact_id} -> {master_contact_id}")
-                child_notes = await self._get_contact_notes(client, child_contact_id, child_api_key)
-                if not child_notes:
-                    logger.info(f"[{contact_pair_number}/{total_matches}] No notes found for child contact {child_contact_id}")
-                    progress['success_count'] += 1
-                    return 0, True
-                if not dry_run:
-                    transferred_count = await self._transfer_notes_to_master(client, master_contact_id, master_api_key, child_notes)
-                    progress['notes_transferred'] += transferred_count
-                    logger.info(f"[{contact_pair_number}/{total_matches}] Successfully transferred {transferred_count}/{len(child_notes)} notes from {child_contact_id} to {master_contact_id}")
-                else:
-                    progress['notes_transferred'] += len(child_notes)
-                    logger.info(f"[{contact_pair_number}/{total_matches}] [DRY RUN] Would transfer {len(child_notes)} notes from {child_contact_id} to {master_contact_id}")
-                progress['success_count'] += 1
-                return len(child_notes), True
-            except Exception as e:
-                error_msg = f"[{contact_pair_number}/{total_matches}] Exception processing contact pair {match.get('child_contact_id')} -> {match.get('master_contact_id')}: {str(e)}"
-                progress['recent_errors'].append(error_msg)
-                progress['error_count'] += 1
-                logger.error(error_msg)
-                return 0, False
-            finally:
-                progress['completed'] += 1
-                elapsed = (datetime.now() - progress['start_time']).total_seconds()
-                if elapsed > 0 and progress['completed'] > 0:
-                    rate = progress['completed'] / elapsed * 60  # items per minute
-                    progress['rate'] = f"{rate:.1f}"
-                    if progress['completed'] < total_matches:
-                        remaining = total_matches - progress['completed']
-                        eta_seconds = remaining / (progress['completed'] / elapsed)
-                        if eta_seconds < 60:
-                            progress['eta'] = f"{eta_seconds:.0f} seconds"
-                        else:
-                            progress['eta'] = f"{eta_seconds/60:.1f} minutes"
-                    else:
-                        progress['eta'] = "Complete"
-                if len(progress['recent_errors']) > 10:
-                    progress['recent_errors'] = progress['recent_errors'][-10:]
-                if progress['completed'] % 5 == 0 or progress['completed'] == total_matches:
-                    logger.info(f"Progress: {progress['completed']}/{total_matches} contacts processed, {progress['success_count']} successful, {progress['notes_transferred']} notes transferred")
-
-        async with httpx.AsyncClient(timeout=60) as client:
-            for batch_start in range(0, total_matches, batch_size):
-                batch_end = min(batch_start + batch_size, total_matches)
-                batch_matches = matches[batch_start:batch_end]
-                current_batch_num = batch_start // batch_size + 1
-                progress['current_batch'] = current_batch_num
-                progress['status'] = f'processing_batch_{current_batch_num}'
-                logger.info(f"Processing batch {current_batch_num}: contacts {batch_start + 1}-{batch_end}")
-
-                # Process each contact pair in the batch concurrently
-                tasks = [process_contact_pair(match, match_index, batch_start, client, account_api_keys, dry_run, total_matches, progress)
-                         for match_index, match in enumerate(batch_matches)]
-                await asyncio.gather(*tasks)
-
-                logger.info(f"Completed batch {current_batch_num}: {len(batch_matches)} contacts processed")
-                if batch_end < total_matches:
-                    await asyncio.sleep(0.5)  # Reduced delay for faster throughput
-
-        progress['status'] = 'completed'
-        logger.info(f"Notes transfer completed: {processed_contacts} contacts processed, {progress['success_count']} successful, {progress['error_count']} errors, {progress['notes_transferred']} notes transferred")
-        await self._save_operation_results(processing_id, matches, progress)
-
     async def _get_contact_notes(self, client: httpx.AsyncClient, contact_id: str, api_key: str) -> List[Dict]:
         """Get all notes for a contact"""
         
         try:
             url = f"https://rest.gohighlevel.com/v1/contacts/{contact_id}/notes/"
-            headers = {"Authorization": f"Bearer {api_key}"}
-            
-            response = await client.get(url, headers=headers)
+            response = await client.get(url, headers=_auth_headers(api_key))
             response.raise_for_status()
             
             data = response.json()
@@ -510,44 +557,47 @@ class MasterChildNotesService:
         master_api_key: str, 
         notes: List[Dict]
     ) -> int:
-        """Transfer notes to master contact"""
-        
+        """Transfer notes to master contact, posting up to NOTE_TRANSFER_CONCURRENCY notes at once"""
+
+        url = f"https://rest.gohighlevel.com/v1/contacts/{master_contact_id}/notes/"
+        headers = _auth_headers(master_api_key)
+        semaphore = asyncio.Semaphore(NOTE_TRANSFER_CONCURRENCY)
+
+        async def post_note(note: Dict) -> bool:
+            # Prepare note body with source information
+            original_body = note.get('body', '')
+            created_by = note.get('createdBy', 'Unknown')
+            created_at = note.get('createdAt', '')
+
+            # Add source information to the note
+            enhanced_body = f"[Transferred from child contact]\n{original_body}\n\n--- Original note created by: {created_by} at {created_at} ---"
+            payload = {"body": enhanced_body}
+
+            async with semaphore:
+                for attempt in range(NOTE_TRANSFER_MAX_RETRIES + 1):
+                    response = await client.post(url, headers=headers, json=payload)
+                    # Back off only when rate limited
+                    if response.status_code == 429 and attempt < NOTE_TRANSFER_MAX_RETRIES:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    response.raise_for_status()
+                    logger.info(f"Successfully transferred note to master contact {master_contact_id}")
+                    return True
+            return False
+
+        results = await asyncio.gather(*(post_note(note) for note in notes), return_exceptions=True)
+
         transferred_count = 0
-        
-        for note in notes:
-            try:
-                # Prepare note body with source information
-                original_body = note.get('body', '')
-                created_by = note.get('createdBy', 'Unknown')
-                created_at = note.get('createdAt', '')
-                
-                # Add source information to the note
-                enhanced_body = f"[Transferred from child contact]\n{original_body}\n\n--- Original note created by: {created_by} at {created_at} ---"
-                
-                url = f"https://rest.gohighlevel.com/v1/contacts/{master_contact_id}/notes/"
-                headers = {
-                    "Authorization": f"Bearer {master_api_key}",
-                    "Content-Type": "application/json"
-                }
-                payload = {"body": enhanced_body}
-                
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                
+        for result in results:
+            if isinstance(result, Exception):
+                # Other notes still go through even if one fails
+                logger.error(f"Error transferring note to master contact {master_contact_id}: {str(result)}")
+            elif result:
                 transferred_count += 1
-                logger.info(f"Successfully transferred note to master contact {master_contact_id}")
-                
-                # Small delay between individual note transfers
-                await asyncio.sleep(0.2)
-                
-            except Exception as e:
-                logger.error(f"Error transferring note to master contact {master_contact_id}: {str(e)}")
-                # Continue with other notes even if one fails
-                continue
-        
+
         return transferred_count
 
-    async def _save_operation_results(self, processing_id: str, matches: List[Dict], progress: Dict):
+    async def _save_operation_results(self, processing_id: str, progress: Dict):
         """Save operation results to file"""
         
         operation_record = {
@@ -560,13 +610,13 @@ class MasterChildNotesService:
                 'total_notes_transferred': progress['notes_transferred'],
                 'dry_run': progress['dry_run']
             },
-            'matches_processed': len(matches),
+            'matches_processed': progress['completed'],
             'final_errors': progress['recent_errors']
         }
         
         results_file = os.path.join(self.results_dir, f"notes_transfer_{processing_id}.json")
-        with open(results_file, 'w') as f:
-            json.dump(operation_record, f, indent=2)
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(operation_record, option=orjson.OPT_INDENT_2))
 
     def get_progress(self, processing_id: str) -> Dict[str, Any]:
         """Get progress for a processing operation"""
@@ -581,59 +631,63 @@ class MasterChildNotesService:
 
     def export_matches_to_csv(self, matches: List[Dict], unmatched: List[Dict]) -> str:
         """Export matches to CSV format"""
-        
-        # Prepare matched contacts data
-        matched_data = []
-        for match in matches:
-            master = match['master_contact']
-            child = match['child_contact']
-            
-            matched_data.append({
-                'Match_Type': match['match_type'],
-                'Match_Score': round(match['match_score'], 3),
-                'Master_Contact_Name': master.get('Contact Name', ''),
-                'Master_Phone': master.get('phone', ''),
-                'Master_Stage': master.get('stage', ''),
-                'Master_Contact_ID': master.get('Contact ID', ''),
-                'Master_Account_ID': master.get('Account Id', ''),
-                'Child_Contact_Name': child.get('Contact Name', ''),
-                'Child_Phone': child.get('phone', ''),
-                'Child_Stage': child.get('stage', ''),
-                'Child_Contact_ID': child.get('Contact ID', ''),
-                'Child_Account_ID': child.get('Account Id', ''),
-                'Potential_Matches_Count': match['potential_matches_count']
-            })
-        
-        # Prepare unmatched data
-        unmatched_data = []
-        for unmatched_contact in unmatched:
-            master = unmatched_contact['master_contact']
-            unmatched_data.append({
-                'Master_Contact_Name': master.get('Contact Name', ''),
-                'Master_Phone': master.get('phone', ''),
-                'Master_Stage': master.get('stage', ''),
-                'Master_Contact_ID': master.get('Contact ID', ''),
-                'Master_Account_ID': master.get('Account Id', ''),
-                'Reason': 'No matching child contact found'
-            })
-        
-        # Create CSV content
+        return ''.join(self.iter_export_matches_to_csv(matches, unmatched))
+
+    def iter_export_matches_to_csv(self, matches: List[Dict], unmatched: List[Dict], batch_size: int = 1000) -> Iterator[str]:
+        """Yield the matches CSV in chunks of batch_size rows, for StreamingResponse"""
         output = io.StringIO()
-        
+        writer = csv.writer(output, lineterminator='\n')
+
+        def flush() -> str:
+            chunk = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return chunk
+
         # Write matched contacts
-        if matched_data:
-            matched_df = pd.DataFrame(matched_data)
+        if matches:
             output.write("=== MATCHED CONTACTS ===\n")
-            matched_df.to_csv(output, index=False)
+            writer.writerow(MATCHED_FIELDS)
+            for row_number, match in enumerate(matches, 1):
+                master = match['master_contact']
+                child = match['child_contact']
+                writer.writerow([
+                    match['match_type'],
+                    round(match['match_score'], 3),
+                    master.get('Contact Name', ''),
+                    master.get('phone', ''),
+                    master.get('stage', ''),
+                    master.get('Contact ID', ''),
+                    master.get('Account Id', ''),
+                    child.get('Contact Name', ''),
+                    child.get('phone', ''),
+                    child.get('stage', ''),
+                    child.get('Contact ID', ''),
+                    child.get('Account Id', ''),
+                    match['potential_matches_count']
+                ])
+                if row_number % batch_size == 0:
+                    yield flush()
             output.write("\n\n")
-        
+
         # Write unmatched contacts
-        if unmatched_data:
-            unmatched_df = pd.DataFrame(unmatched_data)
+        if unmatched:
             output.write("=== UNMATCHED MASTER CONTACTS ===\n")
-            unmatched_df.to_csv(output, index=False)
-        
-        return output.getvalue()
+            writer.writerow(UNMATCHED_FIELDS)
+            for row_number, unmatched_contact in enumerate(unmatched, 1):
+                master = unmatched_contact['master_contact']
+                writer.writerow([
+                    master.get('Contact Name', ''),
+                    master.get('phone', ''),
+                    master.get('stage', ''),
+                    master.get('Contact ID', ''),
+                    master.get('Account Id', ''),
+                    'No matching child contact found'
+                ])
+                if row_number % batch_size == 0:
+                    yield flush()
+
+        yield flush()
 
 # Create global instance
 master_child_service = MasterChildNotesService()
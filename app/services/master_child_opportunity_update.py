@@ -1,21 +1,288 @@
 import asyncio
 import csv
+import functools
+import hashlib
 import io
-import json
 import os
+import random
+import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 import logging
+import numpy as np
+import orjson
 import pandas as pd
 import httpx
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 import re
 from app.config import settings
+from app.services.csv_reader import CSV_ENGINE, read_string_csv
+
+try:
+    # Only used for the optional Feather copies, which need CSV_ENGINE == 'pyarrow'
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as pafeather
+    import pyarrow.json as pajson
+except ImportError:
+    pass
 
 logger = logging.getLogger(__name__)
 
+_NON_DIGIT_RE = re.compile(r'\D')
+# Deletes every non-decimal Latin-1 character; anything left that is not a digit goes through _NON_DIGIT_RE
+_DIGITS_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if not chr(c).isdecimal()))
+
+# CSV columns read by parse_csv_files; everything else is skipped when parsing
+OPPORTUNITY_COLUMNS = frozenset({
+    'Opportunity ID', 'Pipeline ID', 'Account Id', 'Contact Name', 'phone', 'stage', 'assigned',
+    'Opportunity Name', 'pipeline', 'status', 'Pipeline Stage ID', 'Lead Value', 'source', 'Created on'
+})
+
+# Upper bound on child x master score cells held in memory at once during matching
+MATCH_BLOCK_CELLS = 2_000_000
+# Best possible match score when both phones are present but their last 7 digits differ:
+# no phone points over full weight, i.e. (0.35 name + 0.25 date) / 1.0
+PHONE_MISMATCH_MAX_SCORE = 0.6
+
+# Matching/processing operations kept in the progress trackers before the oldest is dropped
+MAX_TRACKED_OPERATIONS = 256
+
+# Seconds between appends of per-match update outcomes to the run's NDJSON records file
+RECORDS_FLUSH_INTERVAL = 2.0
+
+# Children found to have no master scoring at or above the threshold are remembered per
+# (master data, threshold) so re-imports of the same sheet skip scoring them
+NO_MATCH_CACHE_TTL = 3600
+NO_MATCH_CACHE_MAX_ENTRIES = 100_000
+
+# Accounts kept in the pipeline mapping cache before the least recently used is evicted
+PIPELINE_CACHE_MAX_ACCOUNTS = 256
+
+# Seconds between stage-resolution cache hit/miss log lines
+STAGE_CACHE_LOG_INTERVAL = 60
+
+# AIMD concurrency per API key for opportunity PUTs: +0.5 per window of fast responses,
+# halved on throttling (429/502/503) or slow windows, starting at settings.max_concurrent_requests
+AIMD_MIN_CONCURRENCY = 1
+AIMD_MAX_CONCURRENCY = 20
+AIMD_INCREASE = 0.5
+AIMD_DECREASE = 0.5
+AIMD_WINDOW = 10
+AIMD_TARGET_LATENCY = 1.0
+THROTTLE_STATUS_CODES = (429, 502, 503)
+
+# Sliding window over which settings.ghl_requests_per_minute is enforced
+RATE_WINDOW_SECONDS = 60.0
+
+# Exponential-backoff retries for transient PUT failures (status codes and transport errors)
+RETRY_MAX_TRIES = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+RETRY_EXCEPTIONS = (httpx.ReadTimeout, httpx.ConnectError)
+
+
+def _ratio(a: str, b: str, score_cutoff: float = 0) -> int:
+    """rapidfuzz fuzz.ratio rounded to an int (0-100) like fuzzywuzzy's; 0 below score_cutoff"""
+    return round(fuzz.ratio(a, b, score_cutoff=score_cutoff))
+
+
+@functools.lru_cache(maxsize=200_000)
+def _normalize_phone(phone: str) -> str:
+    """Digits of a phone number without the US country code (cached, the same values recur across rows)"""
+    # Remove all non-digit characters
+    digits_only = phone.translate(_DIGITS_TABLE)
+    if not digits_only.isdecimal():
+        digits_only = _NON_DIGIT_RE.sub('', digits_only)
+
+    # If it starts with 1 and has 11 digits, remove the 1
+    if len(digits_only) == 11 and digits_only.startswith('1'):
+        digits_only = digits_only[1:]
+
+    # If it's already 10 digits, keep as is
+    # This handles cases like +17075675820 -> 7075675820
+    return digits_only
+
+
+# Date formats tried in order when reading 'Created on' style fields
+_DATE_FORMATS = ('%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y')
+
+
+@functools.lru_cache(maxsize=200_000)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """Parse a date with the first matching _DATE_FORMATS entry (cached, the same dates recur across rows)"""
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class _AdaptiveLimiter:
+    """Additive-increase/multiplicative-decrease cap on in-flight requests for one API key"""
+
+    def __init__(self, initial: float):
+        self.limit = min(AIMD_MAX_CONCURRENCY, max(AIMD_MIN_CONCURRENCY, float(initial)))
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._latencies = deque(maxlen=AIMD_WINDOW)
+        self._paused_until = 0.0
+
+    async def __aenter__(self):
+        # Honor a Retry-After pause before taking a slot
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _decrease(self):
+        self.limit = max(AIMD_MIN_CONCURRENCY, self.limit * AIMD_DECREASE)
+        self._latencies.clear()
+
+    def observe(self, response: httpx.Response, latency: float):
+        """Adjust the limit from one response: throttling halves it, a fast window grows it"""
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self._decrease()
+            try:
+                retry_after = float(response.headers.get('Retry-After', 1.0))
+            except ValueError:
+                retry_after = 1.0
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            logger.warning(f"Throttled ({response.status_code}); concurrency lowered to {int(self.limit)}, pausing {retry_after:.1f}s")
+            return
+
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and remaining.isdigit() and int(remaining) < self.limit:
+            self._decrease()
+            return
+
+        self._latencies.append(latency)
+        if len(self._latencies) == self._latencies.maxlen:
+            if sum(self._latencies) / len(self._latencies) <= AIMD_TARGET_LATENCY:
+                self.limit = min(AIMD_MAX_CONCURRENCY, self.limit + AIMD_INCREASE)
+            else:
+                self.limit = max(AIMD_MIN_CONCURRENCY, self.limit * AIMD_DECREASE)
+            self._latencies.clear()
+
+
+class _RateWindowLimiter:
+    """Sliding-window cap on requests started per RATE_WINDOW_SECONDS for one API key"""
+
+    def __init__(self, max_requests: int):
+        self.max_requests = max_requests
+        self._started = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until the window has room, then record a request start"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._started and now - self._started[0] >= RATE_WINDOW_SECONDS:
+                    self._started.popleft()
+                if len(self._started) < self.max_requests:
+                    break
+                await asyncio.sleep(RATE_WINDOW_SECONDS - (now - self._started[0]))
+            self._started.append(time.monotonic())
+
+
+class _SyncPlan(NamedTuple):
+    """Stage and value changes for one match plus the master fields their PUTs echo, computed once before the update loop"""
+    child_stage: str
+    master_stage: str
+    needs_stage: bool
+    child_value: float
+    master_value: float
+    needs_value: bool
+    value_error: Optional[str]  # Set when either value could not be parsed
+    master_title: str
+    master_status: str
+
+
+def _opportunity_value(opp: Dict) -> Any:
+    """Raw opportunity value, preferring 'value' over the CSV 'Lead Value' column"""
+    return opp.get('value') or opp.get('Lead Value', 0)
+
+
+def _prepare_sync_plan(child_opp: Dict, master_opp: Dict) -> _SyncPlan:
+    """Normalize the stages and parse the values of a match into a _SyncPlan"""
+    child_stage = (child_opp.get('stage') or '').strip()
+    master_stage = (master_opp.get('stage') or '').strip()
+    needs_stage = bool(child_stage) and child_stage.lower() != master_stage.lower()
+    master_title = master_opp.get('opportunity_name') or ''
+    master_status = master_opp.get('status') or ''
+
+    child_value = _opportunity_value(child_opp)
+    master_value = _opportunity_value(master_opp)
+    try:
+        child_value_float = float(child_value) if child_value else 0.0
+        master_value_float = float(master_value) if master_value else 0.0
+    except (ValueError, TypeError):
+        return _SyncPlan(child_stage, master_stage, needs_stage, 0.0, 0.0, False,
+                         f"child={child_value}, master={master_value}", master_title, master_status)
+    return _SyncPlan(child_stage, master_stage, needs_stage, child_value_float, master_value_float,
+                     child_value_float != master_value_float, None, master_title, master_status)
+
+
 class MasterChildOpportunityUpdateService:
+    # Fallback stage IDs for pipelines whose stages the API does not always return (temporary fix)
+    _KNOWN_STAGES_BY_PIPELINE = {
+        "OYXsfalmHRurVTGchofz": {  # Customer Pipeline
+            "chargeback fix form": "7e7d888c-35f9-4ef4-ae60-8beb170fdfb4",
+            "approved customer - not paid": "c3525ee4-5d03-41bb-b1c8-4ea946c64d06",
+            "first draft payment failure": "993da8ed-ccd9-4c57-a9f4-7fa749ced916",
+            "active placed - paid as earned": "616cedb1-542c-42a4-bd83-701eea8fd6ee",
+            "active placed - paid as advanced": "441e0dd2-277f-40b8-837d-69ed87ab4204",
+            "pending lapse": "40d37746-094d-4cdd-8376-d6f58c9b33bb",
+            "charge-back / payment failure": "b5eded38-9784-4720-94dd-811bf48b2026",
+            "charged-back / canceled policy": "b752e7ff-8a76-46d9-912b-ebbf88a054d3",
+            "active - 3 months +": "b844925a-a050-4728-8f50-b5fe4cf13c26",
+            "active - 6 months +": "d300118d-d20a-4548-9a36-452fc3bb64a7",
+            "active - past charge-back period": "e19c1f3e-7d68-483d-b2bb-344ea6d9a1a4"
+        }
+    }
+
+    # Unmatched CSV columns: (header, source keys tried in order, default)
+    _UNMATCHED_CSV_COLUMNS = (
+        ('Opportunity Name', ('opportunity_name', 'Opportunity Name'), ''),
+        ('Contact Name', ('contact_name', 'Contact Name'), ''),
+        ('Phone', ('phone',), ''),
+        ('Email', ('email',), ''),
+        ('Pipeline', ('pipeline',), ''),
+        ('Stage', ('stage',), ''),
+        ('Lead Value', ('value', 'Lead Value'), '0'),
+        ('Source', ('source',), ''),
+        ('Assigned', ('assigned',), ''),
+        ('Created on', ('Created on', 'created_date'), ''),
+        ('Updated on', ('Updated on',), ''),
+        ('Status', ('status',), ''),
+        ('Opportunity ID', ('opportunity_id', 'Opportunity ID'), ''),
+        ('Contact ID', ('contact_id', 'Contact ID'), ''),
+        ('Pipeline Stage ID', ('pipeline_stage_id', 'Pipeline Stage ID'), ''),
+        ('Pipeline ID', ('pipeline_id', 'Pipeline ID'), ''),
+        ('Account Id', ('account_id', 'Account Id'), ''),
+    )
+    _UNMATCHED_REASON = 'No matching opportunity found in master account'
+
+    # Columns of the unmatched/failed updates export; missing fields are written empty
+    _EXPORT_CSV_FIELDS = (
+        'type', 'contact_name', 'phone', 'email', 'opportunity_name', 'pipeline', 'stage', 'status', 'value',
+        'account_id', 'opportunity_id', 'match_score', 'match_type', 'confidence', 'skip_reason',
+        'error_message', 'timestamp', 'processing_id'
+    )
+
     def __init__(self):
         self.base_dir = os.path.join(os.getcwd(), "master_child_opportunity_updates")
         self.results_dir = os.path.join(self.base_dir, "results")
@@ -25,77 +292,168 @@ class MasterChildOpportunityUpdateService:
         for directory in [self.base_dir, self.results_dir, self.logs_dir]:
             os.makedirs(directory, exist_ok=True)
         
-        # In-memory progress tracking
-        self.progress_tracker = {}
-        self.matching_tracker = {}
+        # In-memory progress tracking, capped at MAX_TRACKED_OPERATIONS entries each
+        self.progress_tracker: OrderedDict = OrderedDict()
+        self.matching_tracker: OrderedDict = OrderedDict()
         
-        # Pipeline and stage mapping cache
-        self.pipeline_cache = {}
+        # Pipeline and stage mapping LRU cache: account_id -> (fetched at, mapping)
+        self.pipeline_cache: OrderedDict = OrderedDict()
+        self._pipeline_locks: Dict[str, asyncio.Lock] = {}
+        self._stage_cache_stats = {'hits': 0, 'misses': 0, 'logged_at': time.monotonic()}
+
+        # Negative matching cache: (master digest, threshold, child fingerprint) -> cached at
+        self._no_match_cache: OrderedDict = OrderedDict()
+
+        # Adaptive request concurrency and requests-per-minute ceiling per API key, kept across runs
+        self._limiters: Dict[str, _AdaptiveLimiter] = {}
+        self._rate_limiters: Dict[str, _RateWindowLimiter] = {}
+
+        # Shared HTTP client, created on first use so it binds to the serving event loop
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _track(tracker: OrderedDict, operation_id: str, state: Dict):
+        """Add an operation to a progress tracker, dropping the oldest past MAX_TRACKED_OPERATIONS"""
+        tracker[operation_id] = state
+        tracker.move_to_end(operation_id)
+        while len(tracker) > MAX_TRACKED_OPERATIONS:
+            tracker.popitem(last=False)
+
+    async def _http(self) -> httpx.AsyncClient:
+        """Long-lived HTTP/2 client reusing keep-alive connections to GoHighLevel across calls"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=httpx.Timeout(60, connect=10)
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _put_with_retry(self, client: httpx.AsyncClient, api_key: str, url: str, headers: Dict[str, str], payload: Dict) -> httpx.Response:
+        """PUT through the API key's adaptive limiter, retrying transient failures with jittered exponential backoff"""
+        limiter = self._limiters.get(api_key)
+        if limiter is None:
+            limiter = self._limiters[api_key] = _AdaptiveLimiter(settings.max_concurrent_requests)
+        rate_limiter = self._rate_limiters.get(api_key)
+        if rate_limiter is None and settings.ghl_requests_per_minute > 0:
+            rate_limiter = self._rate_limiters[api_key] = _RateWindowLimiter(settings.ghl_requests_per_minute)
+
+        for attempt in range(RETRY_MAX_TRIES):
+            last_try = attempt == RETRY_MAX_TRIES - 1
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.random() * 0.1
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            try:
+                async with limiter:
+                    started = time.monotonic()
+                    response = await client.put(url, headers=headers, json=payload)
+            except RETRY_EXCEPTIONS as e:
+                if last_try:
+                    raise
+                logger.warning(f"PUT {url} failed with {type(e).__name__}, retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
 
-    async def get_pipeline_mapping(self, account_id: str, api_key: str) -> Dict[str, Any]:
-        """Get pipeline and stage mapping for an account"""
-        
-        # Always refresh pipeline mapping to ensure we have the latest data
-        # if account_id in self.pipeline_cache:
-        #     return self.pipeline_cache[account_id]
-        
+            limiter.observe(response, time.monotonic() - started)
+            if response.status_code not in RETRY_STATUS_CODES or last_try:
+                return response
+
+            try:
+                delay = min(RETRY_MAX_DELAY, max(delay, float(response.headers.get('Retry-After', 0))))
+            except ValueError:
+                pass
+            logger.warning(f"PUT {url} returned {response.status_code}, retry {attempt + 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def get_pipeline_mapping(self, account_id: str, api_key: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get pipeline and stage mapping for an account, cached for settings.pipeline_cache_ttl seconds"""
+        requested_at = time.monotonic()
+        cached = self.pipeline_cache.get(account_id)
+        if cached and not force_refresh and requested_at - cached[0] < settings.pipeline_cache_ttl:
+            self.pipeline_cache.move_to_end(account_id)
+            return cached[1]
+
+        # Concurrent callers for the same account share one in-flight fetch
+        lock = self._pipeline_locks.setdefault(account_id, asyncio.Lock())
+        async with lock:
+            cached = self.pipeline_cache.get(account_id)
+            if cached and cached[0] >= requested_at:
+                return cached[1]
+            return await self._fetch_pipeline_mapping(account_id, api_key)
+
+    async def _fetch_pipeline_mapping(self, account_id: str, api_key: str) -> Dict[str, Any]:
+        """Fetch pipelines for an account and build the name-to-ID mapping"""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                url = "https://rest.gohighlevel.com/v1/pipelines/"
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                }
+            client = await self._http()
+            url = "https://rest.gohighlevel.com/v1/pipelines/"
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            logger.info(f"Fetching pipeline data for account {account_id}")
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+            
+            pipelines_data = orjson.loads(response.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Raw pipeline response: {orjson.dumps(pipelines_data).decode()}")
+            
+            # Create mapping of pipeline names to IDs and stage names to IDs
+            pipeline_mapping = {
+                'pipelines': {},
+                'stages': {},
+                'pipeline_stages': {},
+                'pipeline_stage_ids': {}  # pipeline_id -> set of stage IDs, for O(1) membership checks
+            }
+            
+            total_stages = 0
+            for pipeline in pipelines_data.get('pipelines', []):
+                pipeline_id = pipeline['id']
+                pipeline_name = pipeline['name'].strip().lower()
                 
-                logger.info(f"Fetching pipeline data for account {account_id}")
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+                logger.debug("Processing pipeline: %s (ID: %s)", pipeline['name'], pipeline_id)
                 
-                pipelines_data = response.json()
-                logger.info(f"Raw pipeline response: {json.dumps(pipelines_data, indent=2)}")
+                # Map pipeline name to ID
+                pipeline_mapping['pipelines'][pipeline_name] = pipeline_id
                 
-                # Create mapping of pipeline names to IDs and stage names to IDs
-                pipeline_mapping = {
-                    'pipelines': {},
-                    'stages': {},
-                    'pipeline_stages': {}
-                }
+                # Map stages for this pipeline
+                pipeline_mapping['pipeline_stages'][pipeline_id] = {}
                 
-                total_stages = 0
-                for pipeline in pipelines_data.get('pipelines', []):
-                    pipeline_id = pipeline['id']
-                    pipeline_name = pipeline['name'].strip().lower()
+                for stage in pipeline.get('stages', []):
+                    stage_id = stage['id']
+                    stage_name = stage['name'].strip()
+                    stage_name_lower = stage_name.lower()
                     
-                    logger.info(f"Processing pipeline: {pipeline['name']} (ID: {pipeline_id})")
+                    logger.debug("  Stage: '%s' (ID: %s)", stage_name, stage_id)
                     
-                    # Map pipeline name to ID
-                    pipeline_mapping['pipelines'][pipeline_name] = pipeline_id
+                    # Map stage name to ID globally (using lowercase for matching)
+                    pipeline_mapping['stages'][stage_name_lower] = stage_id
                     
-                    # Map stages for this pipeline
-                    pipeline_mapping['pipeline_stages'][pipeline_id] = {}
+                    # Map stage name to ID within this pipeline (using lowercase for matching)
+                    pipeline_mapping['pipeline_stages'][pipeline_id][stage_name_lower] = stage_id
                     
-                    for stage in pipeline.get('stages', []):
-                        stage_id = stage['id']
-                        stage_name = stage['name'].strip()
-                        stage_name_lower = stage_name.lower()
-                        
-                        logger.info(f"  Stage: '{stage_name}' (ID: {stage_id})")
-                        
-                        # Map stage name to ID globally (using lowercase for matching)
-                        pipeline_mapping['stages'][stage_name_lower] = stage_id
-                        
-                        # Map stage name to ID within this pipeline (using lowercase for matching)
-                        pipeline_mapping['pipeline_stages'][pipeline_id][stage_name_lower] = stage_id
-                        
-                        total_stages += 1
-                
-                # Cache the mapping
-                self.pipeline_cache[account_id] = pipeline_mapping
-                
-                logger.info(f"Pipeline mapping cached for account {account_id}: {len(pipelines_data.get('pipelines', []))} pipelines, {total_stages} total stages")
-                logger.info(f"All available stages: {list(pipeline_mapping['stages'].keys())}")
-                return pipeline_mapping
+                    total_stages += 1
                 
+                pipeline_mapping['pipeline_stage_ids'][pipeline_id] = set(pipeline_mapping['pipeline_stages'][pipeline_id].values())
+            
+            # Cache the mapping
+            self.pipeline_cache[account_id] = (time.monotonic(), pipeline_mapping)
+            self.pipeline_cache.move_to_end(account_id)
+            while len(self.pipeline_cache) > PIPELINE_CACHE_MAX_ACCOUNTS:
+                self.pipeline_cache.popitem(last=False)
+            
+            logger.info(f"Pipeline mapping cached for account {account_id}: {len(pipelines_data.get('pipelines', []))} pipelines, {total_stages} total stages")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("All available stages: %s", list(pipeline_mapping['stages'].keys()))
+            return pipeline_mapping
+            
         except Exception as e:
             logger.error(f"Error fetching pipeline mapping for account {account_id}: {str(e)}")
             return {
@@ -104,24 +462,53 @@ class MasterChildOpportunityUpdateService:
                 'pipeline_stages': {}
             }
 
+    def _pipeline_stage_ids(self, pipeline_mapping: Dict, pipeline_id: str) -> Optional[set]:
+        """Stage IDs of a pipeline, or None when the mapping has no data for it"""
+        stage_ids = pipeline_mapping.get('pipeline_stage_ids', {}).get(pipeline_id)
+        if stage_ids is None and pipeline_id in pipeline_mapping.get('pipeline_stages', {}):
+            # Mappings built elsewhere may only carry the name -> ID dicts
+            stage_ids = set(pipeline_mapping['pipeline_stages'][pipeline_id].values())
+        return stage_ids
+
     def find_stage_id(self, stage_name: str, pipeline_id: str, pipeline_mapping: Dict) -> Optional[str]:
-        """Find stage ID based on stage name and pipeline"""
+        """Find stage ID based on stage name and pipeline, memoized on the mapping it was resolved against"""
         
         if not stage_name:
             return None
-            
+        
+        # The cache lives on the mapping, so a refreshed mapping starts with an empty one
+        resolved_stages = pipeline_mapping.setdefault('resolved_stages', {})
+        key = (pipeline_id, stage_name.strip().lower())
+        if key in resolved_stages:
+            self._stage_cache_stats['hits'] += 1
+            stage_id = resolved_stages[key]
+        else:
+            self._stage_cache_stats['misses'] += 1
+            stage_id = resolved_stages[key] = self._resolve_stage_id(stage_name, pipeline_id, pipeline_mapping)
+        
+        now = time.monotonic()
+        if now - self._stage_cache_stats['logged_at'] >= STAGE_CACHE_LOG_INTERVAL:
+            self._stage_cache_stats['logged_at'] = now
+            logger.info(f"Stage resolution cache: {self._stage_cache_stats['hits']} hits, {self._stage_cache_stats['misses']} misses")
+        
+        return stage_id
+
+    def _resolve_stage_id(self, stage_name: str, pipeline_id: str, pipeline_mapping: Dict) -> Optional[str]:
+        """Resolve a stage ID by exact, global and fuzzy lookup"""
+        
         stage_name_normalized = stage_name.strip().lower()
         
         # Debug logging
-        logger.info(f"Looking for stage '{stage_name}' (normalized: '{stage_name_normalized}') in pipeline {pipeline_id}")
+        logger.debug("Looking for stage '%s' (normalized: '%s') in pipeline %s", stage_name, stage_name_normalized, pipeline_id)
         
         # First try to find stage within the specific pipeline
         if pipeline_id in pipeline_mapping.get('pipeline_stages', {}):
             pipeline_stages = pipeline_mapping['pipeline_stages'][pipeline_id]
-            logger.info(f"Available stages in pipeline {pipeline_id}: {list(pipeline_stages.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available stages in pipeline %s: %s", pipeline_id, list(pipeline_stages.keys()))
             if stage_name_normalized in pipeline_stages:
                 stage_id = pipeline_stages[stage_name_normalized]
-                logger.info(f"Found exact match for stage '{stage_name}' in pipeline: {stage_id}")
+                logger.debug("Found exact match for stage '%s' in pipeline: %s", stage_name, stage_id)
                 return stage_id
         
         # Fallback to global stage mapping, but ONLY if the stage actually exists in this pipeline
@@ -129,17 +516,17 @@ class MasterChildOpportunityUpdateService:
             global_stage_id = pipeline_mapping['stages'][stage_name_normalized]
             
             # Verify this stage ID actually exists in the target pipeline
-            if pipeline_id in pipeline_mapping.get('pipeline_stages', {}):
+            pipeline_stage_ids = self._pipeline_stage_ids(pipeline_mapping, pipeline_id)
+            if pipeline_stage_ids is not None:
                 pipeline_stages = pipeline_mapping['pipeline_stages'][pipeline_id]
-                # Check if any stage in this pipeline has the same ID as the global one
-                for existing_stage_name, existing_stage_id in pipeline_stages.items():
-                    if existing_stage_id == global_stage_id:
-                        logger.info(f"Found stage '{stage_name}' in global mapping and verified it exists in pipeline: {global_stage_id}")
-                        return global_stage_id
+                if global_stage_id in pipeline_stage_ids:
+                    logger.debug("Found stage '%s' in global mapping and verified it exists in pipeline: %s", stage_name, global_stage_id)
+                    return global_stage_id
                 
                 # If we get here, the global stage ID doesn't exist in this pipeline
                 logger.warning(f"Stage '{stage_name}' found in global mapping (ID: {global_stage_id}) but not available in pipeline {pipeline_id}")
-                logger.warning(f"Available stages in pipeline: {list(pipeline_stages.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Available stages in pipeline: %s", list(pipeline_stages.keys()))
                 return None
             else:
                 # If we don't have pipeline-specific data, fall back to global (less safe but better than nothing)
@@ -147,64 +534,43 @@ class MasterChildOpportunityUpdateService:
                 return global_stage_id
         
         # Try fuzzy matching for stage names within the specific pipeline first
+        # (score_cutoff 85.5 keeps the old "rounded ratio above 85" rule)
         if pipeline_id in pipeline_mapping.get('pipeline_stages', {}):
             pipeline_stages = pipeline_mapping['pipeline_stages'][pipeline_id]
-            for existing_stage_name, stage_id in pipeline_stages.items():
-                similarity = fuzz.ratio(stage_name_normalized, existing_stage_name)
-                if similarity > 85:
-                    logger.info(f"Fuzzy matched stage '{stage_name}' to '{existing_stage_name}' (ID: {stage_id}, similarity: {similarity}%)")
-                    return stage_id
+            match = process.extractOne(stage_name_normalized, list(pipeline_stages), scorer=fuzz.ratio, score_cutoff=85.5)
+            if match:
+                existing_stage_name, similarity, _ = match
+                stage_id = pipeline_stages[existing_stage_name]
+                logger.info(f"Fuzzy matched stage '{stage_name}' to '{existing_stage_name}' (ID: {stage_id}, similarity: {round(similarity)}%)")
+                return stage_id
         
-        # Try fuzzy matching for stage names globally, but verify they exist in the target pipeline
+        # Try fuzzy matching for stage names globally, but only among stages that exist in the target pipeline
         all_stages = pipeline_mapping.get('stages', {})
-        best_match = None
-        best_similarity = 0
-        
-        for existing_stage_name, stage_id in all_stages.items():
-            similarity = fuzz.ratio(stage_name_normalized, existing_stage_name)
-            if similarity > best_similarity and similarity > 85:
-                # Verify this stage ID exists in the target pipeline
-                if pipeline_id in pipeline_mapping.get('pipeline_stages', {}):
-                    pipeline_stages = pipeline_mapping['pipeline_stages'][pipeline_id]
-                    for pipe_stage_name, pipe_stage_id in pipeline_stages.items():
-                        if pipe_stage_id == stage_id:
-                            best_match = (existing_stage_name, stage_id, similarity)
-                            best_similarity = similarity
-                            break
-                else:
-                    # If no pipeline-specific data, accept the fuzzy match
-                    best_match = (existing_stage_name, stage_id, similarity)
-                    best_similarity = similarity
+        pipeline_stage_ids = self._pipeline_stage_ids(pipeline_mapping, pipeline_id)
+        if pipeline_stage_ids is not None:
+            candidates = [name for name, stage_id in all_stages.items() if stage_id in pipeline_stage_ids]
+        else:
+            # If no pipeline-specific data, accept the fuzzy match
+            candidates = list(all_stages)
         
-        if best_match:
-            existing_stage_name, stage_id, similarity = best_match
-            logger.info(f"Fuzzy matched stage '{stage_name}' to '{existing_stage_name}' (ID: {stage_id}, similarity: {similarity}%) - verified for pipeline")
+        match = process.extractOne(stage_name_normalized, candidates, scorer=fuzz.ratio, score_cutoff=85.5)
+        if match:
+            existing_stage_name, similarity, _ = match
+            stage_id = all_stages[existing_stage_name]
+            logger.info(f"Fuzzy matched stage '{stage_name}' to '{existing_stage_name}' (ID: {stage_id}, similarity: {round(similarity)}%) - verified for pipeline")
             return stage_id
         
         # Log all available stages for debugging
         logger.warning(f"Could not find stage ID for '{stage_name}' in pipeline {pipeline_id}")
-        logger.warning(f"All available stages: {list(pipeline_mapping.get('stages', {}).keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("All available stages: %s", list(pipeline_mapping.get('stages', {}).keys()))
         
         # Fallback: Known stage IDs for Customer Pipeline (temporary fix)
-        if pipeline_id == "OYXsfalmHRurVTGchofz":  # Customer Pipeline
-            known_stages = {
-                "chargeback fix form": "7e7d888c-35f9-4ef4-ae60-8beb170fdfb4",
-                "approved customer - not paid": "c3525ee4-5d03-41bb-b1c8-4ea946c64d06",
-                "first draft payment failure": "993da8ed-ccd9-4c57-a9f4-7fa749ced916",
-                "active placed - paid as earned": "616cedb1-542c-42a4-bd83-701eea8fd6ee",
-                "active placed - paid as advanced": "441e0dd2-277f-40b8-837d-69ed87ab4204",
-                "pending lapse": "40d37746-094d-4cdd-8376-d6f58c9b33bb",
-                "charge-back / payment failure": "b5eded38-9784-4720-94dd-811bf48b2026",
-                "charged-back / canceled policy": "b752e7ff-8a76-46d9-912b-ebbf88a054d3",
-                "active - 3 months +": "b844925a-a050-4728-8f50-b5fe4cf13c26",
-                "active - 6 months +": "d300118d-d20a-4548-9a36-452fc3bb64a7",
-                "active - past charge-back period": "e19c1f3e-7d68-483d-b2bb-344ea6d9a1a4"
-            }
-            
-            if stage_name_normalized in known_stages:
-                stage_id = known_stages[stage_name_normalized]
-                logger.info(f"Using fallback stage mapping for '{stage_name}': {stage_id}")
-                return stage_id
+        known_stages = self._KNOWN_STAGES_BY_PIPELINE.get(pipeline_id)
+        if known_stages and stage_name_normalized in known_stages:
+            stage_id = known_stages[stage_name_normalized]
+            logger.info(f"Using fallback stage mapping for '{stage_name}': {stage_id}")
+            return stage_id
         
         return None
 
@@ -213,8 +579,8 @@ class MasterChildOpportunityUpdateService:
         
         try:
             # Parse master CSV
-            master_df = pd.read_csv(io.StringIO(master_csv_content))
-            child_df = pd.read_csv(io.StringIO(child_csv_content))
+            master_df = self._read_csv(master_csv_content)
+            child_df = self._read_csv(child_csv_content)
             
             # Required columns for opportunity matching and updating (matching your CSV structure)
             required_columns = ['Contact Name', 'phone', 'stage', 'Opportunity ID', 'Pipeline ID', 'Account Id']
@@ -242,88 +608,13 @@ class MasterChildOpportunityUpdateService:
                     'summary': {}
                 }
             
-            # Fill NaN values
-            master_df = master_df.fillna('')
-            child_df = child_df.fillna('')
-            
-            # Extract master opportunities data
-            master_opportunities = []
-            master_account_ids = set()
-            
-            for idx, row in master_df.iterrows():
-                opportunity_id = str(row.get('Opportunity ID', '')).strip()
-                pipeline_id = str(row.get('Pipeline ID', '')).strip()
-                account_id = str(row.get('Account Id', '')).strip()  # Note: 'Account Id' with space
-                contact_name = str(row.get('Contact Name', '')).strip()
-                phone = str(row.get('phone', '')).strip()
-                stage = str(row.get('stage', '')).strip()
-                assigned_to = str(row.get('assigned', '')).strip()  # Current assignment
-                
-                # Skip rows with missing critical data
-                if not all([opportunity_id, pipeline_id, account_id, contact_name]):
-                    logger.warning(f"Skipping master row {idx + 1}: Missing critical data")
-                    continue
-                
-                master_opportunities.append({
-                    'opportunity_id': opportunity_id,
-                    'pipeline_id': pipeline_id,
-                    'account_id': account_id,
-                    'contact_name': contact_name,
-                    'phone': self._normalize_phone(phone),
-                    'stage': stage,
-                    'current_assigned_to': assigned_to,
-                    'opportunity_name': str(row.get('Opportunity Name', '')).strip(),
-                    'pipeline': str(row.get('pipeline', '')).strip(),
-                    'status': str(row.get('status', 'open')).strip(),
-                    'pipeline_stage_id': str(row.get('Pipeline Stage ID', '')).strip(),
-                    'lead_value': str(row.get('Lead Value', '')).strip(),
-                    'source': str(row.get('source', '')).strip(),
-                    'Created on': str(row.get('Created on', '')).strip(),
-                    'row_number': idx + 1,
-                    'has_assignment': bool(assigned_to),
-                    'source_type': 'master'
-                })
-                
-                master_account_ids.add(account_id)
-            
-            # Extract child opportunities data
-            child_opportunities = []
-            child_account_ids = set()
-            
-            for idx, row in child_df.iterrows():
-                opportunity_id = str(row.get('Opportunity ID', '')).strip()
-                pipeline_id = str(row.get('Pipeline ID', '')).strip()
-                account_id = str(row.get('Account Id', '')).strip()  # Note: 'Account Id' with space
-                contact_name = str(row.get('Contact Name', '')).strip()
-                phone = str(row.get('phone', '')).strip()
-                stage = str(row.get('stage', '')).strip()
-                assigned_to = str(row.get('assigned', '')).strip()  # Source assignment
-                
-                # Skip rows with missing critical data (assigned is optional for child records)
-                if not all([opportunity_id, pipeline_id, account_id, contact_name]):
-                    logger.warning(f"Skipping child row {idx + 1}: Missing critical data")
-                    continue
-                
-                child_opportunities.append({
-                    'opportunity_id': opportunity_id,
-                    'pipeline_id': pipeline_id,
-                    'account_id': account_id,
-                    'contact_name': contact_name,
-                    'phone': self._normalize_phone(phone),
-                    'stage': stage,
-                    'assigned_to': assigned_to,
-                    'opportunity_name': str(row.get('Opportunity Name', '')).strip(),
-                    'pipeline': str(row.get('pipeline', '')).strip(),
-                    'status': str(row.get('status', 'open')).strip(),
-                    'pipeline_stage_id': str(row.get('Pipeline Stage ID', '')).strip(),
-                    'lead_value': str(row.get('Lead Value', '')).strip(),
-                    'source': str(row.get('source', '')).strip(),
-                    'Created on': str(row.get('Created on', '')).strip(),
-                    'row_number': idx + 1,
-                    'source_type': 'child'
-                })
-                
-                child_account_ids.add(account_id)
+            # Extract master and child opportunities data
+            master_opportunities = self._extract_opportunities(master_df, 'master')
+            master_account_ids = {opp['account_id'] for opp in master_opportunities}
+
+            # Assigned is optional for child records
+            child_opportunities = self._extract_opportunities(child_df, 'child')
+            child_account_ids = {opp['account_id'] for opp in child_opportunities}
             
             summary = {
                 'master_opportunities': len(master_opportunities),
@@ -355,69 +646,61 @@ class MasterChildOpportunityUpdateService:
                 'summary': {}
             }
 
+    @staticmethod
+    def _read_csv(content: str) -> pd.DataFrame:
+        """Parse the OPPORTUNITY_COLUMNS of CSV text as strings, using the Arrow reader when pyarrow is installed"""
+        return read_string_csv(content.encode('utf-8'), OPPORTUNITY_COLUMNS)
+
+    def _extract_opportunities(self, df: pd.DataFrame, source_type: str) -> List[Dict]:
+        """Build opportunity dicts from a _read_csv frame column-wise, skipping rows missing critical data"""
+        # _read_csv yields text columns with empty cells as '', so no fillna or per-cell str() is needed
+        def column(name: str, default: str = '') -> pd.Series:
+            if name not in df.columns:
+                return pd.Series(default, index=df.index, dtype='string')
+            return df[name].str.strip()
+
+        # Remove all non-digit characters, then drop the leading 1 of 11-digit numbers (+17075675820 -> 7075675820)
+        phone = column('phone').str.translate(_DIGITS_TABLE)
+        leftover = (phone != '') & ~phone.str.isdecimal()
+        if leftover.any():
+            phone[leftover] = phone[leftover].str.replace(_NON_DIGIT_RE, '', regex=True)
+        phone = phone.where(~((phone.str.len() == 11) & phone.str.startswith('1')), phone.str[1:])
+        assigned_to = column('assigned')
+
+        opportunities = pd.DataFrame({
+            'opportunity_id': column('Opportunity ID'),
+            'pipeline_id': column('Pipeline ID'),
+            'account_id': column('Account Id'),  # Note: 'Account Id' with space
+            'contact_name': column('Contact Name'),
+            'phone': phone,
+            'stage': column('stage'),
+            # Current assignment on master rows, source assignment on child rows
+            'current_assigned_to' if source_type == 'master' else 'assigned_to': assigned_to,
+            'opportunity_name': column('Opportunity Name'),
+            'pipeline': column('pipeline'),
+            'status': column('status', 'open'),
+            'pipeline_stage_id': column('Pipeline Stage ID'),
+            'lead_value': column('Lead Value'),
+            'source': column('source'),
+            'Created on': column('Created on'),
+            'row_number': df.index + 1,
+        }, index=df.index)
+        if source_type == 'master':
+            opportunities['has_assignment'] = assigned_to != ''
+        opportunities['source_type'] = source_type
+
+        # Skip rows with missing critical data
+        critical = opportunities[['opportunity_id', 'pipeline_id', 'account_id', 'contact_name']].ne('').all(axis=1)
+        for idx in df.index[~critical.to_numpy()]:
+            logger.warning(f"Skipping {source_type} row {idx + 1}: Missing critical data")
+
+        return opportunities[critical].to_dict(orient='records')
+
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number for comparison"""
         if not phone:
             return ""
-        
-        # Remove all non-digit characters
-        digits_only = re.sub(r'\D', '', phone)
-        
-        # If it starts with 1 and has 11 digits, remove the 1
-        if len(digits_only) == 11 and digits_only.startswith('1'):
-            digits_only = digits_only[1:]
-        
-        # If it's already 10 digits, keep as is
-        # This handles cases like +17075675820 -> 7075675820
-        return digits_only
-
-    def _calculate_match_score(self, master_opp: Dict, child_opp: Dict) -> float:
-        """Calculate match score between master and child opportunities using 5 criteria"""
-        
-        # Phone match (30% weight)
-        phone_score = 0.0
-        if master_opp['phone'] and child_opp['phone']:
-            if master_opp['phone'] == child_opp['phone']:
-                phone_score = 1.0
-        
-        # Contact Name match (25% weight) - fuzzy matching
-        contact_name_score = 0.0
-        if master_opp['contact_name'] and child_opp['contact_name']:
-            contact_name_score = fuzz.ratio(
-                master_opp['contact_name'].lower().strip(),
-                child_opp['contact_name'].lower().strip()
-            ) / 100.0
-        
-        # Opportunity Name match (25% weight) - fuzzy matching
-        opportunity_name_score = 0.0
-        if master_opp.get('opportunity_name') and child_opp.get('opportunity_name'):
-            opportunity_name_score = fuzz.ratio(
-                master_opp['opportunity_name'].lower().strip(),
-                child_opp['opportunity_name'].lower().strip()
-            ) / 100.0
-        
-        # Pipeline match (10% weight) - exact match
-        pipeline_score = 0.0
-        if master_opp.get('pipeline') and child_opp.get('pipeline'):
-            if master_opp['pipeline'].lower().strip() == child_opp['pipeline'].lower().strip():
-                pipeline_score = 1.0
-        
-        # Stage match (10% weight) - exact match
-        stage_score = 0.0
-        if master_opp['stage'] and child_opp['stage']:
-            if master_opp['stage'].lower().strip() == child_opp['stage'].lower().strip():
-                stage_score = 1.0
-        
-        # Calculate weighted score
-        total_score = (
-            (phone_score * 0.30) + 
-            (contact_name_score * 0.25) + 
-            (opportunity_name_score * 0.25) + 
-            (pipeline_score * 0.10) + 
-            (stage_score * 0.10)
-        )
-        
-        return total_score
+        return _normalize_phone(phone)
 
     async def match_opportunities(
         self, 
@@ -432,7 +715,7 @@ class MasterChildOpportunityUpdateService:
         operation_start = datetime.now()
         
         # Initialize matching progress tracking
-        self.matching_tracker[matching_id] = {
+        self._track(self.matching_tracker, matching_id, {
             'status': 'initializing',
             'total_master': len(master_opportunities),
             'total_child': len(child_opportunities),
@@ -443,7 +726,7 @@ class MasterChildOpportunityUpdateService:
             'no_matches': 0,
             'start_time': operation_start.isoformat(),
             'matches': []
-        }
+        })
         
         try:
             logger.info(f"Starting opportunity matching: {len(master_opportunities)} master vs {len(child_opportunities)} child opportunities")
@@ -509,7 +792,8 @@ class MasterChildOpportunityUpdateService:
 
         if master_name and child_name:
             total_weight += 0.35
-            name_similarity = fuzz.ratio(master_name, child_name) / 100.0
+            # Ratios below 70 earn nothing, so rapidfuzz can stop early on them
+            name_similarity = _ratio(master_name, child_name, score_cutoff=69.5) / 100.0
 
             if name_similarity >= 0.95:  # Near exact match
                 score += 0.35
@@ -563,17 +847,100 @@ class MasterChildOpportunityUpdateService:
             date_str = opportunity.get(field, '')
             if date_str:
                 try:
-                    # Try different date formats
-                    for fmt in ['%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y']:
-                        try:
-                            return datetime.strptime(date_str, fmt)
-                        except ValueError:
-                            continue
+                    parsed = _parse_date(date_str)
                 except Exception:
                     continue
+                if parsed:
+                    return parsed
 
         return None
 
+    def _match_features(self, opportunities: List[Dict], phone_codes: Dict[str, int]) -> Dict[str, Any]:
+        """Normalize the phone, name and date fields _calculate_match_score compares, once per opportunity"""
+        phones = [self._normalize_phone(opp.get('phone', '')) for opp in opportunities]
+        names = [opp.get('contact_name', '').strip().lower() for opp in opportunities]
+        dates = [self._extract_date(opp) for opp in opportunities]
+
+        # Phones are compared as integer codes shared between the master and child features
+        encode = lambda values: np.array([phone_codes.setdefault(v, len(phone_codes)) for v in values], dtype=np.int64)
+        date_values = np.array(dates, dtype='datetime64[us]')
+        has_date = ~np.isnat(date_values)
+
+        return {
+            'phone': encode(phones),
+            'local_phone': encode([phone[-7:] for phone in phones]),
+            'has_phone': np.array([bool(phone) for phone in phones], dtype=bool),
+            'names': names,
+            'has_name': np.array([bool(name) for name in names], dtype=bool),
+            'dates': np.where(has_date, date_values.astype(np.int64), 0),
+            'has_date': has_date,
+            # Everything the score depends on, for the negative matching cache
+            'fingerprints': [f"{phone}|{name}|{date}" for phone, name, date in zip(phones, names, dates)],
+        }
+
+    def _score_pairs(
+        self,
+        master: Dict[str, Any],
+        child: Dict[str, Any],
+        master_idx: np.ndarray,
+        child_idx: np.ndarray,
+        name_ratio: np.ndarray
+    ) -> np.ndarray:
+        """
+        _calculate_match_score for master/child index arrays that broadcast together
+        (a row and a column for a matrix, or two equal-length arrays for pairs)
+        """
+        # Phone matching (weight: 40%) - exact 0.4, same last 7 digits 0.3
+        has_phone = child['has_phone'][child_idx] & master['has_phone'][master_idx]
+        phone_score = np.where(
+            child['phone'][child_idx] == master['phone'][master_idx], 0.4,
+            np.where(child['local_phone'][child_idx] == master['local_phone'][master_idx], 0.3, 0.0)
+        )
+
+        # Name matching (weight: 35%) - same rounded ratio tiers as _ratio
+        has_name = child['has_name'][child_idx] & master['has_name'][master_idx]
+        name_similarity = np.rint(name_ratio) / 100.0
+        name_score = np.select(
+            [name_similarity >= 0.95, name_similarity >= 0.85, name_similarity >= 0.70],
+            [0.35, 0.25, 0.15], 0.0
+        )
+
+        # Date matching (weight: 25%) - abs((master - child).days), so the signed difference is floored first
+        has_date = child['has_date'][child_idx] & master['has_date'][master_idx]
+        date_diff = np.abs((master['dates'][master_idx] - child['dates'][child_idx]) // 86_400_000_000)
+        date_score = np.select(
+            [date_diff == 0, date_diff <= 7, date_diff <= 30, date_diff <= 90],
+            [0.25, 0.20, 0.15, 0.10], 0.0
+        )
+
+        # Accumulate in the scalar order so float results are bit-identical
+        score = np.where(has_phone, phone_score, 0.0)
+        score = score + np.where(has_name, name_score, 0.0)
+        score = score + np.where(has_date, date_score, 0.0)
+        total_weight = np.where(has_phone, 0.4, 0.0)
+        total_weight = total_weight + np.where(has_name, 0.35, 0.0)
+        total_weight = total_weight + np.where(has_date, 0.25, 0.0)
+
+        final_score = np.divide(score, total_weight, out=np.zeros_like(score), where=total_weight > 0)
+        return np.minimum(final_score, 1.0)
+
+    def _score_matrix(self, master: Dict[str, Any], child: Dict[str, Any], master_idx: np.ndarray, child_idx: np.ndarray) -> np.ndarray:
+        """Scores of every child in child_idx against every master in master_idx, as a (children x masters) array"""
+        # Ratios below 70 earn nothing, so rapidfuzz can stop early on them
+        name_ratio = process.cdist(
+            [child['names'][i] for i in child_idx], [master['names'][i] for i in master_idx],
+            scorer=fuzz.ratio, score_cutoff=69.5, dtype=np.float64, workers=-1
+        )
+        return self._score_pairs(master, child, master_idx[None, :], child_idx[:, None], name_ratio)
+
+    def _score_pair_list(self, master: Dict[str, Any], child: Dict[str, Any], master_idx: np.ndarray, child_idx: np.ndarray) -> np.ndarray:
+        """Scores of the (child_idx[i], master_idx[i]) pairs"""
+        name_ratio = process.cpdist(
+            [child['names'][i] for i in child_idx], [master['names'][i] for i in master_idx],
+            scorer=fuzz.ratio, score_cutoff=69.5, dtype=np.float64, workers=-1
+        ) if len(child_idx) else np.zeros(0)
+        return self._score_pairs(master, child, master_idx, child_idx, name_ratio)
+
     async def _perform_matching(
         self,
         matching_id: str,
@@ -588,88 +955,155 @@ class MasterChildOpportunityUpdateService:
         tracker['status'] = 'processing'
 
         matches = []
-        matched_master_ids = set()  # Track which masters have already been matched
 
-        for child_idx, child_opp in enumerate(child_opportunities):
-            try:
-                tracker['processed'] = child_idx + 1
-                tracker['status'] = f'processing_child_{child_idx + 1}/{len(child_opportunities)}'
-
-                best_match = None
-                best_score = 0.0
-                best_master_opp = None
-
-                # Compare this child with all available master opportunities
-                for master_opp in master_opportunities:
-                    # Skip if this master has already been matched
-                    if master_opp['opportunity_id'] in matched_master_ids:
-                        continue
-
-                    score = self._calculate_match_score(master_opp, child_opp)
-
-                    if score >= match_threshold and score > best_score:
-                        best_score = score
-                        best_master_opp = master_opp
-
-                # Record match result
-                if best_master_opp:
-                    match_type = 'exact' if best_score >= high_confidence_threshold else 'fuzzy'
-
-                    # Mark this master as matched
-                    matched_master_ids.add(best_master_opp['opportunity_id'])
-
-                    # Only skip if the matched child has the same stage as master (meaning no change needed)
-                    same_stage = (best_master_opp['stage'].lower().strip() == child_opp['stage'].lower().strip())
-                    can_update = not same_stage  # Update unless stages are the same
-                    skip_reason = 'Same stage - no change needed' if same_stage else None
-
-                    match_record = {
-                        'master_opportunity': best_master_opp,
-                        'child_opportunity': child_opp,
-                        'match_score': best_score,
-                        'match_type': match_type,
-                        'confidence': 'high' if best_score >= high_confidence_threshold else 'medium',
-                        'can_update': can_update,
-                        'skip_reason': skip_reason,
-                        # Enhanced data for complete opportunity sync
-                        'sync_data': {
-                            'assigned_to': child_opp['assigned_to'],
-                            'status': child_opp['status'],
-                            'stage': child_opp['stage'],
-                            'pipeline_stage_id': child_opp.get('pipeline_stage_id', ''),
-                            'source_pipeline_id': child_opp['pipeline_id'],
-                            'target_pipeline_id': best_master_opp['pipeline_id']
+        # Masters sharing an opportunity_id are taken together once one of them is matched
+        master_groups: Dict[str, List[int]] = {}
+        for master_idx, master_opp in enumerate(master_opportunities):
+            master_groups.setdefault(master_opp['opportunity_id'], []).append(master_idx)
+        available = np.ones(len(master_opportunities), dtype=bool)
+
+        phone_codes: Dict[str, int] = {}
+        master_features = self._match_features(master_opportunities, phone_codes)
+        child_features = self._match_features(child_opportunities, phone_codes)
+        all_masters = np.arange(len(master_opportunities))
+
+        # Children that had no qualifying master against this master data and threshold in an
+        # earlier run still have none, whatever else was matched, so they skip scoring
+        master_digest = hashlib.blake2b('\n'.join(master_features['fingerprints']).encode(), digest_size=16).digest()
+        no_match_keys = [(master_digest, match_threshold, fingerprint) for fingerprint in child_features['fingerprints']]
+        known_unmatched = np.array([self._is_known_no_match(key) for key in no_match_keys], dtype=bool)
+        if known_unmatched.any():
+            logger.info(f"Skipping scoring for {int(known_unmatched.sum())} children with no qualifying master in a recent run")
+
+        # When both sides have phones whose last 7 digits differ, a pair scores at most
+        # PHONE_MISMATCH_MAX_SCORE, so above that threshold such children only need the masters
+        # sharing their local number plus the masters without a phone
+        block_by_phone = match_threshold > PHONE_MISMATCH_MAX_SCORE
+        masters_by_local_phone: Dict[int, np.ndarray] = {}
+        masters_without_phone = all_masters[~master_features['has_phone']]
+        if block_by_phone:
+            with_phone = all_masters[master_features['has_phone']]
+            local_phones = master_features['local_phone'][with_phone]
+            order = np.argsort(local_phones, kind='stable')
+            keys, starts = np.unique(local_phones[order], return_index=True)
+            for key, group in zip(keys.tolist(), np.split(with_phone[order], starts[1:])):
+                masters_by_local_phone[key] = group
+        blocked_children = child_features['has_phone'] & block_by_phone
+        no_candidates = np.zeros(0, dtype=np.int64)
+
+        block_rows = max(1, MATCH_BLOCK_CELLS // max(1, len(master_opportunities)))
+
+        for block_start in range(0, len(child_opportunities), block_rows):
+            block = np.arange(block_start, min(block_start + block_rows, len(child_opportunities)))
+            scored = block[~known_unmatched[block]]
+            blocked = scored[blocked_children[scored]]
+            unblocked = scored[~blocked_children[scored]]
+
+            # Candidate masters and their scores per child
+            candidates: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+            if len(unblocked):
+                scores = self._score_matrix(master_features, child_features, all_masters, unblocked)
+                for row, child_idx in enumerate(unblocked.tolist()):
+                    candidates[child_idx] = (all_masters, scores[row])
+            if len(blocked):
+                scores = self._score_matrix(master_features, child_features, masters_without_phone, blocked)
+                phone_groups = [
+                    masters_by_local_phone.get(key, no_candidates)
+                    for key in child_features['local_phone'][blocked].tolist()
+                ]
+                pair_masters = np.concatenate(phone_groups) if phone_groups else no_candidates
+                pair_children = np.repeat(blocked, [len(group) for group in phone_groups])
+                pair_scores = np.split(
+                    self._score_pair_list(master_features, child_features, pair_masters, pair_children),
+                    np.cumsum([len(group) for group in phone_groups])[:-1]
+                )
+                for row, child_idx in enumerate(blocked.tolist()):
+                    candidates[child_idx] = (
+                        np.concatenate([phone_groups[row], masters_without_phone]),
+                        np.concatenate([pair_scores[row], scores[row]])
+                    )
+
+            for child_idx in block.tolist():
+                child_opp = child_opportunities[child_idx]
+                try:
+                    tracker['processed'] = child_idx + 1
+                    tracker['status'] = f'processing_child_{child_idx + 1}/{len(child_opportunities)}'
+
+                    best_score = 0.0
+                    best_master_opp = None
+
+                    # Same acceptance rule as the scalar loop: score >= threshold and strictly above the
+                    # running best (0.0), with the first master in file order winning ties
+                    master_idx, candidate_scores = candidates.get(child_idx, (no_candidates, np.zeros(0)))
+                    qualifying = (candidate_scores >= match_threshold) & (candidate_scores > 0.0)
+                    if not qualifying.any() and not known_unmatched[child_idx]:
+                        self._remember_no_match(no_match_keys[child_idx])
+                    eligible = qualifying & available[master_idx]
+                    if eligible.any():
+                        best_score = float(candidate_scores[eligible].max())
+                        best_master_opp = master_opportunities[int(master_idx[eligible & (candidate_scores == best_score)].min())]
+                        # Mark this master as matched
+                        available[master_groups[best_master_opp['opportunity_id']]] = False
+
+                    # Record match result
+                    if best_master_opp:
+                        match_type = 'exact' if best_score >= high_confidence_threshold else 'fuzzy'
+
+                        # Only skip if the matched child has the same stage as master (meaning no change needed)
+                        same_stage = (best_master_opp['stage'].lower().strip() == child_opp['stage'].lower().strip())
+                        can_update = not same_stage  # Update unless stages are the same
+                        skip_reason = 'Same stage - no change needed' if same_stage else None
+
+                        match_record = {
+                            'master_opportunity': best_master_opp,
+                            'child_opportunity': child_opp,
+                            'match_score': best_score,
+                            'match_type': match_type,
+                            'confidence': 'high' if best_score >= high_confidence_threshold else 'medium',
+                            'can_update': can_update,
+                            'skip_reason': skip_reason,
+                            # Enhanced data for complete opportunity sync
+                            'sync_data': {
+                                'assigned_to': child_opp['assigned_to'],
+                                'status': child_opp['status'],
+                                'stage': child_opp['stage'],
+                                'pipeline_stage_id': child_opp.get('pipeline_stage_id', ''),
+                                'source_pipeline_id': child_opp['pipeline_id'],
+                                'target_pipeline_id': best_master_opp['pipeline_id']
+                            }
                         }
-                    }
 
-                    matches.append(match_record)
-                    tracker['matches_found'] += 1
+                        matches.append(match_record)
+                        tracker['matches_found'] += 1
 
-                    if match_type == 'exact':
-                        tracker['exact_matches'] += 1
+                        if match_type == 'exact':
+                            tracker['exact_matches'] += 1
+                        else:
+                            tracker['fuzzy_matches'] += 1
+
+                        logger.info(f"Match found: {child_opp['contact_name']} -> {best_master_opp['contact_name']} (score: {best_score:.2f})")
                     else:
-                        tracker['fuzzy_matches'] += 1
+                        # No match found for this child - create a no-match record
+                        no_match_record = {
+                            'master_opportunity': None,
+                            'child_opportunity': child_opp,
+                            'match_score': 0.0,
+                            'match_type': 'no_match',
+                            'confidence': 'none',
+                            'can_update': False,
+                            'skip_reason': 'No matching master opportunity found',
+                            'sync_data': None
+                        }
 
-                    logger.info(f"Match found: {child_opp['contact_name']} -> {best_master_opp['contact_name']} (score: {best_score:.2f})")
-                else:
-                    # No match found for this child - create a no-match record
-                    no_match_record = {
-                        'master_opportunity': None,
-                        'child_opportunity': child_opp,
-                        'match_score': 0.0,
-                        'match_type': 'no_match',
-                        'confidence': 'none',
-                        'can_update': False,
-                        'skip_reason': 'No matching master opportunity found',
-                        'sync_data': None
-                    }
-
-                    matches.append(no_match_record)
-                    tracker['no_matches'] += 1
-                    logger.info(f"No match found for child: {child_opp['contact_name']} (Phone: {child_opp['phone']})")
+                        matches.append(no_match_record)
+                        tracker['no_matches'] += 1
+                        logger.info(f"No match found for child: {child_opp['contact_name']} (Phone: {child_opp['phone']})")
 
-            except Exception as e:
-                logger.error(f"Error matching child opportunity {child_idx + 1}: {str(e)}")
+                except Exception as e:
+                    logger.error(f"Error matching child opportunity {child_idx + 1}: {str(e)}")
+
+            # Let progress polling run between blocks
+            await asyncio.sleep(0)
 
         # Store matches and mark as completed
         tracker['matches'] = matches
@@ -691,6 +1125,23 @@ class MasterChildOpportunityUpdateService:
 
         logger.info(f"Matching completed: {len(matched_children)} matches found ({tracker['exact_matches']} exact, {tracker['fuzzy_matches']} fuzzy), {len(unmatched_children)} unmatched children")
 
+    def _is_known_no_match(self, key: Tuple) -> bool:
+        """Whether key was recorded as having no qualifying master within NO_MATCH_CACHE_TTL"""
+        cached_at = self._no_match_cache.get(key)
+        if cached_at is None:
+            return False
+        if time.monotonic() - cached_at >= NO_MATCH_CACHE_TTL:
+            del self._no_match_cache[key]
+            return False
+        return True
+
+    def _remember_no_match(self, key: Tuple):
+        """Record key in the negative matching cache, evicting the oldest entries past the size cap"""
+        self._no_match_cache[key] = time.monotonic()
+        self._no_match_cache.move_to_end(key)
+        while len(self._no_match_cache) > NO_MATCH_CACHE_MAX_ENTRIES:
+            self._no_match_cache.popitem(last=False)
+
     def get_matching_progress(self, matching_id: str) -> Dict[str, Any]:
         """Get progress for a matching operation"""
         
@@ -725,7 +1176,7 @@ class MasterChildOpportunityUpdateService:
             filtered_matches.append(match)
         
         # Initialize progress tracking
-        self.progress_tracker[processing_id] = {
+        self._track(self.progress_tracker, processing_id, {
             'status': 'initializing',
             'total': len(filtered_matches),
             'completed': 0,
@@ -733,13 +1184,15 @@ class MasterChildOpportunityUpdateService:
             'error_count': 0,
             'skipped_count': 0,
             'current_batch': 0,
-            'recent_errors': [],
+            'current_match': 0,
+            'recent_errors': deque(maxlen=10),  # Only the last 10 errors are kept
             'start_time': operation_start.isoformat(),
+            'start_monotonic': time.monotonic(),
             'eta': None,
             'rate': None,
             'dry_run': dry_run,
             'process_exact_only': process_exact_only
-        }
+        })
         
         try:
             # Prepare subaccount API keys
@@ -786,125 +1239,94 @@ class MasterChildOpportunityUpdateService:
         
         logger.info(f"Processing {total_matches} opportunity updates with complete data sync")
         
-        # Pre-load pipeline mappings for all accounts
-        pipeline_mappings = {}
-        # Filter out no_match records before extracting account IDs
-        valid_matches = [match for match in matches if match.get('master_opportunity') is not None]
-        unique_accounts = set(match['master_opportunity']['account_id'] for match in valid_matches)
+        # Split off no_match records, plan their changes and collect the accounts to update in a single pass
+        valid_matches = []
+        sync_plans = []
+        unique_accounts = set()
+        unchanged_matches = 0
+        for match in matches:
+            master_opp = match.get('master_opportunity')
+            if master_opp is None:
+                continue
+            plan = _prepare_sync_plan(match.get('child_opportunity') or {}, master_opp)
+            if not (plan.needs_stage or plan.needs_value or plan.value_error):
+                # Stage and value already match the child, so there is nothing to send; unparseable
+                # values stay queued so the update step reports them
+                unchanged_matches += 1
+                continue
+            valid_matches.append(match)
+            sync_plans.append(plan)
+            unique_accounts.add(master_opp['account_id'])
         
-        for account_id in unique_accounts:
-            api_key = account_api_keys.get(account_id)
-            if api_key:
-                pipeline_mappings[account_id] = await self.get_pipeline_mapping(account_id, api_key)
+        skipped_matches = total_matches - len(valid_matches)
+        if skipped_matches:
+            progress['completed'] += skipped_matches
+            progress['skipped_count'] += unchanged_matches
+            logger.info(f"Skipping {skipped_matches - unchanged_matches} no_match records and {unchanged_matches} matches without changes")
+        
+        # Pre-load pipeline mappings for all accounts concurrently (cached for settings.pipeline_cache_ttl)
+        preload_tasks = {
+            account_id: asyncio.create_task(self.get_pipeline_mapping(account_id, account_api_keys[account_id]))
+            for account_id in unique_accounts if account_api_keys.get(account_id)
+        }
+        pipeline_mappings = {}
+        for account_id, task in preload_tasks.items():
+            try:
+                pipeline_mappings[account_id] = await task
                 logger.info(f"Loaded pipeline mapping for account {account_id}")
+            except Exception as e:
+                logger.error(f"Failed to load pipeline mapping for account {account_id}: {str(e)}")
         
-        async with httpx.AsyncClient(timeout=60) as client:
-            for batch_start in range(0, total_matches, batch_size):
-                batch_end = min(batch_start + batch_size, total_matches)
-                batch_matches = matches[batch_start:batch_end]
-                current_batch_num = batch_start // batch_size + 1
-                
-                progress['current_batch'] = current_batch_num
-                progress['status'] = f'processing_batch_{current_batch_num}'
-                
-                logger.info(f"Processing batch {current_batch_num}: matches {batch_start + 1}-{batch_end}")
-                
-                # Process each match in the batch
-                for match_index, match in enumerate(batch_matches):
-                    match_number = batch_start + match_index + 1
-                    
-                    try:
-                        # Skip no_match records where master_opportunity is None
-                        if match.get('master_opportunity') is None:
-                            logger.info(f"[{match_number}/{total_matches}] Skipping no_match record")
-                            continue
-                            
-                        master_opp = match['master_opportunity']
-                        child_opp = match['child_opportunity']
-                        sync_data = match['sync_data']
-                        
-                        opportunity_id = master_opp['opportunity_id']
-                        pipeline_id = master_opp['pipeline_id']
-                        account_id = master_opp['account_id']
-                        
-                        # Update progress status
-                        progress['status'] = f'processing_match_{match_number}/{total_matches}'
-                        
-                        # Get API key for this account
-                        api_key = account_api_keys.get(account_id)
-                        if not api_key:
-                            error_msg = f"[{match_number}/{total_matches}] No API key found for account {account_id}"
-                            progress['recent_errors'].append(error_msg)
-                            progress['error_count'] += 1
-                            logger.error(error_msg)
-                            continue
-                        
-                        # Get pipeline mapping for this account
-                        pipeline_mapping = pipeline_mappings.get(account_id, {})
-                        
-                        logger.info(f"[{match_number}/{total_matches}] Updating opportunity {opportunity_id} with selective fields (Score: {match['match_score']:.2f})")
-                        logger.info(f"  → Pipeline Stage: {child_opp.get('stage', 'N/A')}")
-                        logger.info(f"  → Opportunity Value: {child_opp.get('value', child_opp.get('Lead Value', 'N/A'))}")
-
-                        # Update opportunity with selective fields only (pipeline stage and value)
-                        if not dry_run:
-                            success = await self._update_master_opportunity_selective(
-                                client, pipeline_id, opportunity_id, child_opp, master_opp, api_key, pipeline_mapping
-                            )
-
-                            if success:
-                                progress['success_count'] += 1
-                                logger.info(f"[{match_number}/{total_matches}] Successfully updated opportunity {opportunity_id}")
-                            else:
-                                progress['error_count'] += 1
-                                logger.error(f"[{match_number}/{total_matches}] Failed to update opportunity {opportunity_id}")
-                        else:
-                            progress['success_count'] += 1
-                            logger.info(f"[{match_number}/{total_matches}] [DRY RUN] Would update opportunity {opportunity_id}")
-                            logger.info(f"  → Would update stage to: {child_opp.get('stage', 'N/A')}")
-                            logger.info(f"  → Would update value to: {child_opp.get('value', child_opp.get('Lead Value', 'N/A'))}")
-                        
-                        processed_matches += 1
-                        
-                    except Exception as e:
-                        error_msg = f"[{match_number}/{total_matches}] Exception updating match: {str(e)}"
-                        progress['recent_errors'].append(error_msg)
-                        progress['error_count'] += 1
-                        logger.error(error_msg)
-                    
-                    finally:
-                        progress['completed'] += 1
-                        
-                        # Update ETA and rate calculations
-                        elapsed = (datetime.now() - datetime.fromisoformat(progress['start_time'])).total_seconds()
-                        if elapsed > 0 and progress['completed'] > 0:
-                            rate = progress['completed'] / elapsed * 60  # items per minute
-                            progress['rate'] = f"{rate:.1f}"
-                            
-                            if progress['completed'] < total_matches:
-                                remaining = total_matches - progress['completed']
-                                eta_seconds = remaining / (progress['completed'] / elapsed)
-                                if eta_seconds < 60:
-                                    progress['eta'] = f"{eta_seconds:.0f} seconds"
-                                else:
-                                    progress['eta'] = f"{eta_seconds/60:.1f} minutes"
-                            else:
-                                progress['eta'] = "Complete"
-                        
-                        # Keep only recent errors (last 10)
-                        if len(progress['recent_errors']) > 10:
-                            progress['recent_errors'] = progress['recent_errors'][-10:]
-                        
-                        # Log progress every 5 matches
-                        if progress['completed'] % 5 == 0 or progress['completed'] == total_matches:
-                            logger.info(f"Progress: {progress['completed']}/{total_matches} matches processed, {progress['success_count']} successful, {progress['error_count']} errors")
-                
-                # Log batch completion
-                logger.info(f"Completed batch {current_batch_num}: {len(batch_matches)} matches processed")
-                
-                # Small delay between batches to prevent rate limiting
-                if batch_end < total_matches:
-                    await asyncio.sleep(1.0)
+        # account_id -> (api_key, pipeline mapping), resolved once for the whole run
+        account_contexts = {
+            account_id: (account_api_keys[account_id], pipeline_mappings.get(account_id, {}))
+            for account_id in preload_tasks
+        }
+        
+        # Per-match outcomes are appended as NDJSON every RECORDS_FLUSH_INTERVAL seconds instead of held until completion
+        records_file = self._records_file(processing_id)
+        pending_records: List[bytes] = []
+        last_flush = time.monotonic()
+        
+        client = await self._http()
+        for batch_start in range(0, len(valid_matches), batch_size):
+            batch_end = min(batch_start + batch_size, len(valid_matches))
+            batch_matches = valid_matches[batch_start:batch_end]
+            batch_plans = sync_plans[batch_start:batch_end]
+            current_batch_num = batch_start // batch_size + 1
+            
+            progress['current_batch'] = current_batch_num
+            progress['status'] = f'processing_batch_{current_batch_num}'
+            
+            logger.info(f"Processing batch {current_batch_num}: matches {skipped_matches + batch_start + 1}-{skipped_matches + batch_end}")
+            
+            # Process the matches in the batch concurrently
+            results = await asyncio.gather(*(
+                self._process_one_update(
+                    client, match, plan, skipped_matches + batch_start + match_index + 1, total_matches,
+                    account_contexts, dry_run, progress
+                )
+                for match_index, (match, plan) in enumerate(zip(batch_matches, batch_plans))
+            ))
+            processed_matches += sum(results)
+            
+            pending_records.extend(
+                orjson.dumps({
+                    'match_number': skipped_matches + batch_start + match_index + 1,
+                    'master_opportunity_id': match['master_opportunity'].get('opportunity_id'),
+                    'child_opportunity_id': (match.get('child_opportunity') or {}).get('opportunity_id'),
+                    'match_score': match.get('match_score'),
+                    'processed': processed
+                }) + b'\n'
+                for match_index, (match, processed) in enumerate(zip(batch_matches, results))
+            )
+            if batch_end == len(valid_matches) or time.monotonic() - last_flush >= RECORDS_FLUSH_INTERVAL:
+                await asyncio.to_thread(self._append_bytes, records_file, b''.join(pending_records))
+                pending_records.clear()
+                last_flush = time.monotonic()
+            
+            # Log batch completion
+            logger.info(f"Completed batch {current_batch_num}: {len(batch_matches)} matches processed")
         
         # Mark as completed
         progress['status'] = 'completed'
@@ -930,6 +1352,93 @@ class MasterChildOpportunityUpdateService:
             }
         }
 
+    async def _process_one_update(
+        self,
+        client: httpx.AsyncClient,
+        match: Dict,
+        plan: _SyncPlan,
+        match_number: int,
+        total_matches: int,
+        account_contexts: Dict[str, Tuple[str, Dict]],
+        dry_run: bool,
+        progress: Dict
+    ) -> bool:
+        """Update (or dry-run) the master opportunity of one match; returns True when it was processed"""
+        try:
+            master_opp = match['master_opportunity']
+            
+            opportunity_id = master_opp['opportunity_id']
+            pipeline_id = master_opp['pipeline_id']
+            account_id = master_opp['account_id']
+            
+            # Record the match number only; get_progress builds the status string on read
+            progress['current_match'] = match_number
+            
+            # Get API key and pipeline mapping for this account
+            account_context = account_contexts.get(account_id)
+            if account_context is None:
+                error_msg = f"[{match_number}/{total_matches}] No API key found for account {account_id}"
+                progress['recent_errors'].append(error_msg)
+                progress['error_count'] += 1
+                logger.error(error_msg)
+                return False
+            api_key, pipeline_mapping = account_context
+            
+            logger.info(f"[{match_number}/{total_matches}] Updating opportunity {opportunity_id} with selective fields (Score: {match['match_score']:.2f})")
+            logger.info(f"  → Pipeline Stage: {plan.child_stage or 'N/A'}")
+            logger.info(f"  → Opportunity Value: {plan.child_value}")
+
+            # Update opportunity with selective fields only (pipeline stage and value)
+            if not dry_run:
+                success = await self._update_master_opportunity_selective(
+                    client, pipeline_id, opportunity_id, plan, api_key, pipeline_mapping
+                )
+
+                if success:
+                    progress['success_count'] += 1
+                    logger.info(f"[{match_number}/{total_matches}] Successfully updated opportunity {opportunity_id}")
+                else:
+                    progress['error_count'] += 1
+                    logger.error(f"[{match_number}/{total_matches}] Failed to update opportunity {opportunity_id}")
+            else:
+                progress['success_count'] += 1
+                logger.info(f"[{match_number}/{total_matches}] [DRY RUN] Would update opportunity {opportunity_id}")
+                logger.info(f"  → Would update stage to: {plan.child_stage or 'N/A'}")
+                logger.info(f"  → Would update value to: {plan.child_value}")
+            
+            return True
+            
+        except Exception as e:
+            error_msg = f"[{match_number}/{total_matches}] Exception updating match: {str(e)}"
+            progress['recent_errors'].append(error_msg)
+            progress['error_count'] += 1
+            logger.error(error_msg)
+            return False
+        
+        finally:
+            progress['completed'] += 1
+            
+            # Update ETA and rate calculations at the logging cadence
+            report = progress['completed'] % 5 == 0 or progress['completed'] == total_matches
+            elapsed = time.monotonic() - progress['start_monotonic']
+            if report and elapsed > 0:
+                rate = progress['completed'] / elapsed * 60  # items per minute
+                progress['rate'] = f"{rate:.1f}"
+                
+                if progress['completed'] < total_matches:
+                    remaining = total_matches - progress['completed']
+                    eta_seconds = remaining / (progress['completed'] / elapsed)
+                    if eta_seconds < 60:
+                        progress['eta'] = f"{eta_seconds:.0f} seconds"
+                    else:
+                        progress['eta'] = f"{eta_seconds/60:.1f} minutes"
+                else:
+                    progress['eta'] = "Complete"
+            
+            # Log progress every 5 matches
+            if report:
+                logger.info(f"Progress: {progress['completed']}/{total_matches} matches processed, {progress['success_count']} successful, {progress['error_count']} errors")
+
     async def _update_master_opportunity_complete(
         self, 
         client: httpx.AsyncClient, 
@@ -974,7 +1483,7 @@ class MasterChildOpportunityUpdateService:
             
             # Try to update with owner assignment first
             try:
-                owner_response = await client.put(owner_url, headers=headers, json=owner_payload)
+                owner_response = await self._put_with_retry(client, api_key, owner_url, headers, owner_payload)
                 owner_response.raise_for_status()
                 
                 if "assignedTo" in owner_payload:
@@ -989,7 +1498,7 @@ class MasterChildOpportunityUpdateService:
                     logger.warning(f"Invalid user ID '{sync_data['assigned_to']}' for opportunity {opportunity_id}, updating without owner assignment")
                     # Retry without assignedTo field
                     fallback_payload = {k: v for k, v in owner_payload.items() if k != "assignedTo"}
-                    owner_response = await client.put(owner_url, headers=headers, json=fallback_payload)
+                    owner_response = await self._put_with_retry(client, api_key, owner_url, headers, fallback_payload)
                     owner_response.raise_for_status()
                     owner_updated = False
                 else:
@@ -1033,7 +1542,7 @@ class MasterChildOpportunityUpdateService:
                     "stageId": target_stage_id
                 }
                 
-                status_response = await client.put(status_url, headers=headers, json=status_payload)
+                status_response = await self._put_with_retry(client, api_key, status_url, headers, status_payload)
                 status_response.raise_for_status()
                 
                 logger.info(f"Successfully updated opportunity {opportunity_id} status to '{sync_data['status']}' and stage to '{sync_data['stage']}' (ID: {target_stage_id})")
@@ -1043,7 +1552,7 @@ class MasterChildOpportunityUpdateService:
                     "status": sync_data['status']
                 }
                 
-                status_response = await client.put(status_url, headers=headers, json=status_payload)
+                status_response = await self._put_with_retry(client, api_key, status_url, headers, status_payload)
                 status_response.raise_for_status()
                 
                 logger.warning(f"Updated opportunity {opportunity_id} status to '{sync_data['status']}' but could not find stage ID for '{sync_data['stage']}'")
@@ -1084,8 +1593,7 @@ class MasterChildOpportunityUpdateService:
         client: httpx.AsyncClient,
         pipeline_id: str,
         opportunity_id: str,
-        child_opp: Dict,
-        master_opp: Dict,
+        plan: _SyncPlan,
         api_key: str,
         pipeline_mapping: Dict
     ) -> bool:
@@ -1101,36 +1609,25 @@ class MasterChildOpportunityUpdateService:
             update_data = {}
 
             # 1. Update pipeline stage if different
-            child_stage = child_opp.get('stage', '').strip()
-            master_stage = master_opp.get('stage', '').strip()
-
-            if child_stage and child_stage.lower() != master_stage.lower():
+            if plan.needs_stage:
                 # Find the correct stage ID for the target pipeline
-                target_stage_id = self.find_stage_id(child_stage, pipeline_id, pipeline_mapping)
+                target_stage_id = self.find_stage_id(plan.child_stage, pipeline_id, pipeline_mapping)
                 if target_stage_id:
                     update_data['stageId'] = target_stage_id
-                    logger.info(f"Will update stage from '{master_stage}' to '{child_stage}' (ID: {target_stage_id})")
+                    logger.info(f"Will update stage from '{plan.master_stage}' to '{plan.child_stage}' (ID: {target_stage_id})")
                 else:
-                    logger.warning(f"Could not find stage ID for '{child_stage}' in pipeline {pipeline_id}")
+                    logger.warning(f"Could not find stage ID for '{plan.child_stage}' in pipeline {pipeline_id}")
 
             # 2. Update opportunity value if different
-            child_value = child_opp.get('value') or child_opp.get('Lead Value', 0)
-            master_value = master_opp.get('value') or master_opp.get('Lead Value', 0)
-
-            # Convert to float for comparison
-            try:
-                child_value_float = float(child_value) if child_value else 0.0
-                master_value_float = float(master_value) if master_value else 0.0
-
-                if child_value_float != master_value_float:
-                    update_data['value'] = child_value_float
-                    logger.info(f"Will update value from {master_value_float} to {child_value_float}")
-            except (ValueError, TypeError):
-                logger.warning(f"Could not parse opportunity values: child={child_value}, master={master_value}")
+            if plan.value_error:
+                logger.warning(f"Could not parse opportunity values: {plan.value_error}")
+            elif plan.needs_value:
+                update_data['value'] = plan.child_value
+                logger.info(f"Will update value from {plan.master_value} to {plan.child_value}")
 
-            # Only proceed if there are changes to make
+            # Only proceed if there are changes to make (the stage may not resolve to an ID)
             if not update_data:
-                logger.info(f"No changes needed for opportunity {opportunity_id} - values already match")
+                logger.info(f"No changes applied to opportunity {opportunity_id}")
                 return True
 
             # Use the status update endpoint to change stage
@@ -1141,10 +1638,10 @@ class MasterChildOpportunityUpdateService:
                 }
 
                 # Include status if available
-                if master_opp.get('status'):
-                    status_payload['status'] = master_opp['status']
+                if plan.master_status:
+                    status_payload['status'] = plan.master_status
 
-                status_response = await client.put(status_url, headers=headers, json=status_payload)
+                status_response = await self._put_with_retry(client, api_key, status_url, headers, status_payload)
                 status_response.raise_for_status()
                 logger.info(f"Successfully updated opportunity {opportunity_id} stage")
 
@@ -1156,12 +1653,12 @@ class MasterChildOpportunityUpdateService:
                 }
 
                 # Include required fields to maintain data integrity
-                if master_opp.get('opportunity_name'):
-                    value_payload['title'] = master_opp['opportunity_name']
-                if master_opp.get('status'):
-                    value_payload['status'] = master_opp['status']
+                if plan.master_title:
+                    value_payload['title'] = plan.master_title
+                if plan.master_status:
+                    value_payload['status'] = plan.master_status
 
-                value_response = await client.put(opp_url, headers=headers, json=value_payload)
+                value_response = await self._put_with_retry(client, api_key, opp_url, headers, value_payload)
                 value_response.raise_for_status()
                 logger.info(f"Successfully updated opportunity {opportunity_id} value to {update_data['value']}")
 
@@ -1190,36 +1687,22 @@ class MasterChildOpportunityUpdateService:
         if not unmatched_opportunities:
             return ""
 
-        # Prepare data for CSV
-        csv_data = []
-        for opp in unmatched_opportunities:
-            csv_row = {
-                'Opportunity Name': opp.get('opportunity_name', opp.get('Opportunity Name', '')),
-                'Contact Name': opp.get('contact_name', opp.get('Contact Name', '')),
-                'Phone': opp.get('phone', ''),
-                'Email': opp.get('email', ''),
-                'Pipeline': opp.get('pipeline', ''),
-                'Stage': opp.get('stage', ''),
-                'Lead Value': opp.get('value', opp.get('Lead Value', '0')),
-                'Source': opp.get('source', ''),
-                'Assigned': opp.get('assigned', ''),
-                'Created on': opp.get('Created on', opp.get('created_date', '')),
-                'Updated on': opp.get('Updated on', ''),
-                'Status': opp.get('status', ''),
-                'Opportunity ID': opp.get('opportunity_id', opp.get('Opportunity ID', '')),
-                'Contact ID': opp.get('contact_id', opp.get('Contact ID', '')),
-                'Pipeline Stage ID': opp.get('pipeline_stage_id', opp.get('Pipeline Stage ID', '')),
-                'Pipeline ID': opp.get('pipeline_id', opp.get('Pipeline ID', '')),
-                'Account Id': opp.get('account_id', opp.get('Account Id', '')),
-                'Match Reason': 'No matching opportunity found in master account'
-            }
-            csv_data.append(csv_row)
-
-        # Convert to CSV
+        # Stream rows straight into the CSV, taking the first source key present for each column
+        columns = self._UNMATCHED_CSV_COLUMNS
         output = io.StringIO()
-        if csv_data:
-            df = pd.DataFrame(csv_data)
-            df.to_csv(output, index=False)
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow([header for header, _, _ in columns] + ['Match Reason'])
+        for opp in unmatched_opportunities:
+            row = []
+            for _, keys, default in columns:
+                value = default
+                for key in keys:
+                    if key in opp:
+                        value = opp[key]
+                        break
+                row.append(value)
+            row.append(self._UNMATCHED_REASON)
+            writer.writerow(row)
 
         csv_content = output.getvalue()
 
@@ -1248,12 +1731,52 @@ class MasterChildOpportunityUpdateService:
                 'dry_run': progress['dry_run']
             },
             'matches_processed': len(matches),
-            'final_errors': progress['recent_errors']
+            'final_errors': list(progress['recent_errors'])
         }
         
+        records_file = self._records_file(processing_id)
+        if os.path.exists(records_file):
+            operation_record['records_file'] = records_file
+            if settings.results_feather_copies and CSV_ENGINE == 'pyarrow':
+                operation_record['records_feather_file'] = await asyncio.to_thread(self._write_feather_copy, records_file)
+        
         results_file = os.path.join(self.results_dir, f"master_child_opportunity_update_{processing_id}.json")
-        with open(results_file, 'w') as f:
-            json.dump(operation_record, f, indent=2)
+        # Compact unless debugging; the file is machine-read
+        option = orjson.OPT_INDENT_2 if logger.isEnabledFor(logging.DEBUG) else 0
+        # Write from a worker thread so the file I/O does not stall the event loop
+        await asyncio.to_thread(self._write_bytes, results_file, orjson.dumps(operation_record, option=option))
+
+    def _records_file(self, processing_id: str) -> str:
+        """Path of the NDJSON file holding per-match outcomes of an update run"""
+        return os.path.join(self.results_dir, f"master_child_opportunity_update_{processing_id}.ndjson")
+
+    def _write_feather_copy(self, path: str) -> str:
+        """Write an Arrow Feather copy of a CSV export or NDJSON records file next to it"""
+        if path.endswith('.ndjson'):
+            table = pajson.read_json(path)
+        else:
+            # Keep IDs and phones as text; only the score is numeric
+            convert_options = pacsv.ConvertOptions(
+                column_types={field: pa.string() for field in self._EXPORT_CSV_FIELDS if field != 'match_score'},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False
+            )
+            table = pacsv.read_csv(path, convert_options=convert_options)
+        feather_path = os.path.splitext(path)[0] + '.feather'
+        pafeather.write_feather(table, feather_path)
+        return feather_path
+
+    @staticmethod
+    def _write_bytes(path: str, data: bytes):
+        """Write data to path, replacing any existing file"""
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    @staticmethod
+    def _append_bytes(path: str, data: bytes):
+        """Append data to path"""
+        with open(path, 'ab') as f:
+            f.write(data)
 
     def get_progress(self, processing_id: str) -> Dict[str, Any]:
         """Get progress for a processing operation"""
@@ -1261,13 +1784,19 @@ class MasterChildOpportunityUpdateService:
         if processing_id not in self.progress_tracker:
             return {'success': False, 'message': 'Processing ID not found'}
         
+        progress = self.progress_tracker[processing_id]
+        snapshot = {**progress, 'recent_errors': list(progress['recent_errors'])}
+        if progress['current_match'] and progress['status'].startswith('processing_batch_'):
+            snapshot['status'] = f"processing_match_{progress['current_match']}/{progress['total']}"
         return {
             'success': True,
-            'progress': self.progress_tracker[processing_id]
+            'progress': snapshot
         }
 
-    def generate_sample_csvs(self) -> Tuple[str, str]:
-        """Generate sample CSV templates for master and child files"""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def generate_sample_csvs() -> Tuple[str, str]:
+        """Generate sample CSV templates for master and child files (built once, the rows are fixed)"""
         
         # Master opportunities sample (matching your structure)
         master_sample_data = [
@@ -1390,18 +1919,15 @@ class MasterChildOpportunityUpdateService:
         ]
         
         # Convert to CSV
-        master_output = io.StringIO()
-        child_output = io.StringIO()
-        
-        if master_sample_data:
-            master_df = pd.DataFrame(master_sample_data)
-            master_df.to_csv(master_output, index=False)
-        
-        if child_sample_data:
-            child_df = pd.DataFrame(child_sample_data)
-            child_df.to_csv(child_output, index=False)
+        outputs = []
+        for sample_data in (master_sample_data, child_sample_data):
+            output = io.StringIO()
+            writer = csv.DictWriter(output, fieldnames=list(sample_data[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(sample_data)
+            outputs.append(output.getvalue())
         
-        return master_output.getvalue(), child_output.getvalue()
+        return outputs[0], outputs[1]
 
     async def export_unmatched_and_failed_to_csv(self, processing_id: str) -> str:
         """Export unmatched records and failed updates to CSV"""
@@ -1411,12 +1937,10 @@ class MasterChildOpportunityUpdateService:
             if not progress:
                 # Try to find any recent processing data
                 if self.progress_tracker:
-                    # Get the most recent processing ID
-                    recent_ids = list(self.progress_tracker.keys())
-                    if recent_ids:
-                        processing_id = recent_ids[-1]  # Use the most recent
-                        progress = self.progress_tracker.get(processing_id)
-                        logger.info(f"Using most recent processing ID: {processing_id}")
+                    # Use the most recent processing ID (dicts keep insertion order)
+                    processing_id = next(reversed(self.progress_tracker))
+                    progress = self.progress_tracker[processing_id]
+                    logger.info(f"Using most recent processing ID: {processing_id}")
 
             if not progress:
                 return "Error: No processing data found. Please complete the sync process first."
@@ -1424,92 +1948,79 @@ class MasterChildOpportunityUpdateService:
             # Get the matching tracker data - try to find it by looking for recent matching data
             tracker = self.matching_tracker.get(processing_id)
             if not tracker and self.matching_tracker:
-                # Try to find matching data from recent operations
-                recent_matching_ids = list(self.matching_tracker.keys())
-                if recent_matching_ids:
-                    recent_matching_id = recent_matching_ids[-1]
-                    tracker = self.matching_tracker.get(recent_matching_id)
-                    logger.info(f"Using recent matching data from ID: {recent_matching_id}")
+                # Try to find matching data from the most recent operation
+                recent_matching_id = next(reversed(self.matching_tracker))
+                tracker = self.matching_tracker[recent_matching_id]
+                logger.info(f"Using recent matching data from ID: {recent_matching_id}")
 
             if not tracker:
                 # If no matching data, just export failed updates
                 logger.warning(f"No matching data found for processing {processing_id}, exporting failed updates only")
 
-            # Prepare CSV data
-            csv_data = []
-            timestamp = datetime.now().isoformat()
-
-            # Add unmatched records if we have matching data
-            if tracker:
-                matches = tracker.get('matches', [])
-                for match in matches:
-                    if match.get('match_type') == 'no_match':
-                        child_opp = match.get('child_opportunity', {})
-                        csv_data.append({
-                            'type': 'unmatched',
-                            'contact_name': child_opp.get('contact_name', ''),
-                            'phone': child_opp.get('phone', ''),
-                            'email': child_opp.get('email', ''),
-                            'opportunity_name': child_opp.get('opportunity_name', ''),
-                            'pipeline': child_opp.get('pipeline', ''),
-                            'stage': child_opp.get('stage', ''),
-                            'status': child_opp.get('status', ''),
-                            'value': child_opp.get('value', ''),
-                            'account_id': child_opp.get('account_id', ''),
-                            'opportunity_id': child_opp.get('opportunity_id', ''),
-                            'match_score': match.get('match_score', 0.0),
-                            'match_type': match.get('match_type', ''),
-                            'confidence': match.get('confidence', ''),
-                            'skip_reason': match.get('skip_reason', ''),
-                            'error_message': '',
-                            'timestamp': timestamp,
-                            'processing_id': processing_id
-                        })
-
-            # Add failed updates from recent_errors
-            recent_errors = progress.get('recent_errors', [])
-            for error in recent_errors:
-                csv_data.append({
-                    'type': 'failed_update',
-                    'contact_name': '',
-                    'phone': '',
-                    'email': '',
-                    'opportunity_name': '',
-                    'pipeline': '',
-                    'stage': '',
-                    'status': '',
-                    'value': '',
-                    'account_id': '',
-                    'opportunity_id': '',
-                    'match_score': 0.0,
-                    'match_type': '',
-                    'confidence': '',
-                    'skip_reason': '',
-                    'error_message': error,
-                    'timestamp': timestamp,
-                    'processing_id': processing_id
-                })
+            # Unmatched records (if we have matching data) and failed updates from recent_errors; the
+            # matches are filtered while writing rather than copied into a list first
+            matches = tracker.get('matches', []) if tracker else []
+            errors = list(progress.get('recent_errors', []))
 
             # If no data at all, return informative message
-            if not csv_data:
+            if not errors and not any(match.get('match_type') == 'no_match' for match in matches):
                 return "No unmatched records or failed updates found to export."
 
-            df = pd.DataFrame(csv_data)
-
             # Create filename with timestamp
             filename = f"unmatched_and_failed_updates_{processing_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             filepath = os.path.join(self.results_dir, filename)
 
-            # Save to file
-            df.to_csv(filepath, index=False)
+            # Stream the rows to file from a worker thread so the write does not stall the event loop
+            timestamp = datetime.now().isoformat()
+            record_count = await asyncio.to_thread(self._write_export_csv, filepath, matches, errors, timestamp, processing_id)
+            if settings.results_feather_copies and CSV_ENGINE == 'pyarrow':
+                await asyncio.to_thread(self._write_feather_copy, filepath)
 
-            logger.info(f"Exported {len(csv_data)} records to {filepath}")
+            logger.info(f"Exported {record_count} records to {filepath}")
 
-            return f"Successfully exported {len(csv_data)} records to {filename}"
+            return f"Successfully exported {record_count} records to {filename}"
 
         except Exception as e:
             logger.error(f"Error exporting unmatched and failed records: {str(e)}")
             return f"Error exporting data: {str(e)}"
 
+    def _write_export_csv(self, filepath: str, matches: List[Dict], errors: List[str], timestamp: str, processing_id: str) -> int:
+        """Write the no_match children among matches and failed update errors to filepath, one row at a time; returns the row count"""
+        record_count = len(errors)
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self._EXPORT_CSV_FIELDS, lineterminator='\n')
+            writer.writeheader()
+
+            # Fields shared by every row of a kind; DictWriter fills the rest with ''
+            unmatched_row = {'type': 'unmatched', 'timestamp': timestamp, 'processing_id': processing_id}
+            failed_row = {'type': 'failed_update', 'match_score': 0.0, 'timestamp': timestamp, 'processing_id': processing_id}
+
+            for match in matches:
+                if match.get('match_type') != 'no_match':
+                    continue
+                record_count += 1
+                child_opp = match.get('child_opportunity', {})
+                writer.writerow(unmatched_row | {
+                    'contact_name': child_opp.get('contact_name', ''),
+                    'phone': child_opp.get('phone', ''),
+                    'email': child_opp.get('email', ''),
+                    'opportunity_name': child_opp.get('opportunity_name', ''),
+                    'pipeline': child_opp.get('pipeline', ''),
+                    'stage': child_opp.get('stage', ''),
+                    'status': child_opp.get('status', ''),
+                    'value': child_opp.get('value', ''),
+                    'account_id': child_opp.get('account_id', ''),
+                    'opportunity_id': child_opp.get('opportunity_id', ''),
+                    'match_score': match.get('match_score', 0.0),
+                    'match_type': match.get('match_type', ''),
+                    'confidence': match.get('confidence', ''),
+                    'skip_reason': match.get('skip_reason', '')
+                })
+
+            for error in errors:
+                writer.writerow(failed_row | {'error_message': error})
+
+        return record_count
+
 # Create global instance
 master_child_opportunity_service = MasterChildOpportunityUpdateService()
@@ -1,5 +1,7 @@
 import pytest
 import asyncio
+import httpx
+import orjson
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.services.ghl_opportunity_updater_v2 import GHLOpportunityUpdaterV2
 
@@ -35,7 +37,7 @@ async def test_get_pipeline_id_by_name(mock_access_token, sample_pipelines):
     with patch('httpx.AsyncClient') as mock_client:
         # Mock the response
         mock_response = MagicMock()
-        mock_response.json.return_value = {"pipelines": sample_pipelines}
+        mock_response.content = orjson.dumps({"pipelines": sample_pipelines})
         mock_response.raise_for_status.return_value = None
         
         mock_client.return_value.get = AsyncMock(return_value=mock_response)
@@ -62,7 +64,7 @@ async def test_get_stage_id_by_name(mock_access_token, sample_pipelines):
     with patch('httpx.AsyncClient') as mock_client:
         # Mock the response
         mock_response = MagicMock()
-        mock_response.json.return_value = {"pipelines": sample_pipelines}
+        mock_response.content = orjson.dumps({"pipelines": sample_pipelines})
         mock_response.raise_for_status.return_value = None
         
         mock_client.return_value.get = AsyncMock(return_value=mock_response)
@@ -94,7 +96,7 @@ async def test_update_opportunity_v2_success(mock_access_token):
         # Mock successful response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "opp_123", "status": "updated"}
+        mock_response.content = b'{"id": "opp_123", "status": "updated"}'
         mock_response.text = '{"id": "opp_123", "status": "updated"}'
         mock_response.headers = {"content-type": "application/json"}
         mock_response.raise_for_status.return_value = None
@@ -120,7 +122,7 @@ async def test_update_opportunity_v2_success(mock_access_token):
         mock_client.return_value.put.assert_called_once()
         call_args = mock_client.return_value.put.call_args
         assert call_args[0][0] == "https://services.leadconnectorhq.com/opportunities/opp_123"
-        assert call_args[1]["json"] == payload
+        assert orjson.loads(call_args[1]["content"]) == payload
         
         await updater.close()
 
@@ -160,6 +162,79 @@ async def test_update_opportunity_v2_failure(mock_access_token):
         
         await updater.close()
 
+@pytest.mark.asyncio
+async def test_pipelines_shared_across_instances(mock_access_token, sample_pipelines):
+    """Test that a second updater for the same location reuses cached pipelines"""
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_response = MagicMock()
+        mock_response.content = orjson.dumps({"pipelines": sample_pipelines})
+        mock_response.raise_for_status.return_value = None
+
+        mock_client.return_value.get = AsyncMock(return_value=mock_response)
+
+        first = GHLOpportunityUpdaterV2(mock_access_token, "shared_location")
+        assert await first.get_pipelines() == sample_pipelines
+
+        second = GHLOpportunityUpdaterV2(mock_access_token, "shared_location")
+        assert await second.get_pipelines() == sample_pipelines
+
+        # Only the first instance should have hit the API
+        assert mock_client.return_value.get.call_count == 1
+
+        # Invalidation forces the next lookup back to the API
+        await second.invalidate_pipelines()
+        third = GHLOpportunityUpdaterV2(mock_access_token, "shared_location")
+        assert await third.get_pipelines() == sample_pipelines
+        assert mock_client.return_value.get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_shared_pipelines_not_served_to_other_tokens(mock_access_token, sample_pipelines):
+    """Test that pipelines cached by one token are not returned to a different token for the same location"""
+    with patch('httpx.AsyncClient') as mock_client:
+        ok = MagicMock()
+        ok.content = orjson.dumps({"pipelines": sample_pipelines})
+        ok.raise_for_status.return_value = None
+        unauthorized = MagicMock(status_code=401, text="Unauthorized")
+        unauthorized.content = b'{"message": "Invalid JWT"}'
+        unauthorized.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "401 Unauthorized", request=MagicMock(), response=unauthorized
+        )
+        mock_client.return_value.get = AsyncMock(side_effect=[ok, unauthorized])
+
+        warm = GHLOpportunityUpdaterV2(mock_access_token, "scoped_location")
+        assert await warm.get_pipelines() == sample_pipelines
+
+        revoked = GHLOpportunityUpdaterV2("revoked_token", "scoped_location")
+        assert await revoked.get_pipelines() == []
+        assert mock_client.return_value.get.call_count == 2
+
+def test_pipeline_updated_webhook_requires_secret():
+    """Test that the cache-invalidation webhook only evicts entries for callers sending the configured secret"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import bulk_update_pipeline_stage as routes
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+    url = "/api/webhooks/ghl/pipeline-updated"
+
+    with patch.object(routes, 'invalidate_pipelines_cache', new=AsyncMock()) as invalidate, \
+            patch.object(routes.settings, 'ghl_webhook_secret', 'hook-secret'):
+        assert client.post(url, json={"locationId": "loc_1"}).status_code == 401
+        assert client.post(url, json={"locationId": "loc_1"}, headers={"X-Webhook-Secret": "wrong"}).status_code == 401
+        invalidate.assert_not_called()
+
+        response = client.post(url, json={"locationId": "loc_1"}, headers={"X-Webhook-Secret": "hook-secret"})
+        assert response.status_code == 200
+        invalidate.assert_awaited_once_with("loc_1")
+
+    with patch.object(routes, 'invalidate_pipelines_cache', new=AsyncMock()) as invalidate, \
+            patch.object(routes.settings, 'ghl_webhook_secret', ''):
+        # Without a configured secret the webhook is disabled
+        assert client.post(url, json={"locationId": "loc_1"}, headers={"X-Webhook-Secret": ""}).status_code == 401
+        invalidate.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_headers_configuration(mock_access_token):
     """Test that headers are configured correctly"""
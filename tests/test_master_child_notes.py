@@ -0,0 +1,137 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.master_child_notes import MasterChildNotesService
+
+MASTER_CSV = """Opportunity Name,Contact Name,phone,stage,Contact ID,Account Id
+Jane Doe - (555) 123-4567,Jane Doe,15551234567,New Lead,master_1,1
+John Smith - (555) 987-6543,John Smith,5559876543,New Lead,master_2,1
+Nobody Here,Nobody Here,5550000000,New Lead,master_3,1
+"""
+
+CHILD_CSV = """Opportunity Name,Contact Name,phone,stage,Contact ID,Account Id
+Jane Doe - (555) 123-4567,Jane Doe,+1 (555) 123-4567,New Lead,child_1,2
+Jon Smyth - (555) 987-6543,Jon Smyth,555-987-6543,New Lead,child_2,2
+Someone Else,Someone Else,5551112222,New Lead,child_3,2
+"""
+
+@pytest.mark.asyncio
+async def test_match_contacts_classifies_matches():
+    """Test exact, fuzzy and unmatched classification"""
+    service = MasterChildNotesService()
+
+    result = await service.match_contacts(MASTER_CSV, CHILD_CSV)
+
+    assert result['success'] is True
+    pairs = {m['master_contact_id']: (m['child_contact_id'], m['match_type']) for m in result['matches']}
+    assert pairs['master_1'] == ('child_1', 'exact')
+    assert pairs['master_2'][0] == 'child_2'
+    assert [u['master_contact_id'] for u in result['unmatched_master']] == ['master_3']
+    assert result['summary']['no_matches'] == 1
+    assert result['summary']['exact_matches'] + result['summary']['fuzzy_matches'] == 2
+
+def test_normalize_phone():
+    """Test phone normalization strips formatting and country code"""
+    service = MasterChildNotesService()
+
+    assert service.normalize_phone("+1 (555) 123-4567") == "5551234567"
+    assert service.normalize_phone("15551234567.0") == "5551234567"
+    assert service.normalize_phone("") == ""
+
+@pytest.mark.asyncio
+async def test_transfer_notes_retries_rate_limited_posts():
+    """Test notes are posted concurrently, retried on 429 and failures are skipped"""
+    service = MasterChildNotesService()
+
+    ok = MagicMock(status_code=200)
+    rate_limited = MagicMock(status_code=429)
+    failed = MagicMock(status_code=500)
+    failed.raise_for_status.side_effect = Exception("Server error")
+
+    client = MagicMock()
+    client.post = AsyncMock(side_effect=[ok, rate_limited, failed, ok])
+    notes = [{'body': 'first'}, {'body': 'second'}, {'body': 'third'}]
+
+    with patch('app.services.master_child_notes.asyncio.sleep', new=AsyncMock()):
+        transferred = await service._transfer_notes_to_master(client, 'master_1', 'key', notes)
+
+    assert transferred == 2
+    assert client.post.call_count == 4
+
+def test_calculate_similarity_score_weights():
+    """Test phone/name/stage weighting of the similarity score"""
+    service = MasterChildNotesService()
+
+    master = {'Contact Name': 'Jane Doe', 'phone': '5551234567', 'stage': 'New Lead'}
+    assert service.calculate_similarity_score(master, dict(master)) == 1.0
+    assert service.calculate_similarity_score(master, {'Contact Name': 'Jane Doe'}) == 0.3
+    assert service.calculate_similarity_score({}, {}) == 0.0
+
+@pytest.mark.asyncio
+async def test_process_notes_transfer_consumes_match_stream(monkeypatch, tmp_path):
+    """Test streamed matches are transferred by the queue workers"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('SUBACCOUNTS', '[{"id": "1", "api_key": "master_key"}, {"id": "2", "api_key": "child_key"}]')
+    service = MasterChildNotesService()
+    service._get_contact_notes = AsyncMock(return_value=[{'body': 'note'}])
+    service._transfer_notes_to_master = AsyncMock(return_value=1)
+
+    result = await service.process_notes_transfer(service.match_contacts_stream(MASTER_CSV, CHILD_CSV))
+
+    assert result['success'] is True
+    assert result['notes_transferred'] == 2
+    progress = service.get_progress(result['processing_id'])['progress']
+    assert progress['total'] == 2
+    assert progress['completed'] == 2
+    master_ids = {call.args[1] for call in service._transfer_notes_to_master.call_args_list}
+    assert master_ids == {'master_1', 'master_2'}
+
+def test_read_csv_pads_ragged_rows():
+    """Test short rows are padded with '' and values keep their text form"""
+    ragged_csv = "Contact Name,phone,Contact ID\nJane Doe,0555123456,master_1\nJohn Smith,0\nShort Row\n"
+
+    df = MasterChildNotesService._read_csv(ragged_csv)
+
+    assert df.to_dict('records') == [
+        {'Contact Name': 'Jane Doe', 'phone': '0555123456', 'Contact ID': 'master_1'},
+        {'Contact Name': 'John Smith', 'phone': '0', 'Contact ID': ''},
+        {'Contact Name': 'Short Row', 'phone': '', 'Contact ID': ''},
+    ]
+
+@pytest.mark.asyncio
+async def test_process_notes_transfer_survives_malformed_match(monkeypatch, tmp_path):
+    """Test a match missing its contact dicts is counted as an error without stopping the other pairs"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('SUBACCOUNTS', '[{"id": "1", "api_key": "master_key"}, {"id": "2", "api_key": "child_key"}]')
+    service = MasterChildNotesService()
+    service._get_contact_notes = AsyncMock(return_value=[{'body': 'note'}])
+    service._transfer_notes_to_master = AsyncMock(return_value=1)
+    good = {
+        'master_contact_id': 'master_1', 'child_contact_id': 'child_1', 'match_type': 'exact',
+        'master_contact': {'Account Id': '1'}, 'child_contact': {'Account Id': '2'}
+    }
+    malformed = {'master_contact_id': 'master_2', 'child_contact_id': 'child_2', 'match_type': 'exact'}
+
+    result = await service.process_notes_transfer([malformed, good, dict(good)], concurrency=1)
+
+    assert result['notes_transferred'] == 2
+    assert result['error_count'] == 1
+    assert service.get_progress(result['processing_id'])['progress']['completed'] == 3
+
+@pytest.mark.asyncio
+async def test_process_notes_transfer_dry_run_posts_nothing(monkeypatch, tmp_path):
+    """Test a dry run counts the child notes without posting them and completes the progress entry"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('SUBACCOUNTS', '[{"id": "1", "api_key": "master_key"}, {"id": "2", "api_key": "child_key"}]')
+    service = MasterChildNotesService()
+    service._get_contact_notes = AsyncMock(return_value=[{'body': 'first'}, {'body': 'second'}])
+    service._transfer_notes_to_master = AsyncMock(return_value=2)
+
+    result = await service.process_notes_transfer(service.match_contacts_stream(MASTER_CSV, CHILD_CSV), dry_run=True)
+
+    assert result['notes_transferred'] == 4
+    service._transfer_notes_to_master.assert_not_called()
+    progress = service.get_progress(result['processing_id'])['progress']
+    assert progress['status'] == 'completed'
+    assert progress['success_count'] == 2
+    assert progress['eta'] == 'Complete'
+    assert progress['rate'] is not None
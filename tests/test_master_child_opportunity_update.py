@@ -0,0 +1,125 @@
+import pytest
+import httpx
+from collections import OrderedDict
+from unittest.mock import AsyncMock, patch
+from app.services.master_child_opportunity_update import MasterChildOpportunityUpdateService
+
+OPPORTUNITY_HEADER = "Opportunity ID,Pipeline ID,Account Id,Contact Name,phone,stage,assigned,status,Created on\n"
+
+# Missing phones on both sides, a duplicated master opportunity_id and names below the name threshold
+MASTER_CSV = OPPORTUNITY_HEADER + """m1,p1,A1,Jane Doe,(707) 567-5820,New Lead,,open,2024-01-05
+m2,p1,A1,Jane Doe,,New Lead,,open,2024-01-05
+m2,p1,A1,Janet Doe,7075675820,Contacted,,open,2024-01-06
+m3,p1,A1,John Smith,,New Lead,,open,2024-02-01
+m4,p1,A1,Zed Quux,5551112222,New Lead,,open,2023-06-01
+m5,p1,A1,Jon Smyth,5559876543,New Lead,,open,2024-02-03
+"""
+
+CHILD_CSV = OPPORTUNITY_HEADER + """c1,p2,A2,Jane Doe,+1 707 567 5820,Sold,u1,won,2024-01-05
+c2,p2,A2,Jane Doe,,Sold,u1,won,2024-01-05
+c3,p2,A2,John Smith,,Contacted,u2,open,2024-02-02
+c4,p2,A2,Alice Wonder,5551112222,Sold,u3,won,2023-06-01
+c5,p2,A2,Jon Smyth,5559876543,New Lead,u4,open,2024-02-03
+c6,p2,A2,Jon Smyth,,Contacted,u4,open,
+"""
+
+
+def _client(statuses):
+    """AsyncClient whose PUTs answer with the given status codes in order"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], json={})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+@pytest.mark.asyncio
+async def test_put_with_retry_recovers_from_transient_status():
+    """Test that a 503 followed by success is retried"""
+    service = MasterChildOpportunityUpdateService()
+    client, calls = _client([503, 200])
+    with patch('asyncio.sleep', new=AsyncMock()):
+        response = await service._put_with_retry(client, 'key', 'https://example.test/opp', {}, {'status': 'open'})
+    await client.aclose()
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_put_with_retry_does_not_retry_client_errors():
+    """Test that a 422 is returned after a single attempt"""
+    service = MasterChildOpportunityUpdateService()
+    client, calls = _client([422])
+    response = await service._put_with_retry(client, 'key', 'https://example.test/opp', {}, {'status': 'open'})
+    await client.aclose()
+
+    assert response.status_code == 422
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_put_with_retry_gives_up_after_max_tries():
+    """Test that persistent 429s stop after three attempts"""
+    service = MasterChildOpportunityUpdateService()
+    client, calls = _client([429])
+    with patch('asyncio.sleep', new=AsyncMock()):
+        response = await service._put_with_retry(client, 'key', 'https://example.test/opp', {}, {'status': 'open'})
+    await client.aclose()
+
+    assert response.status_code == 429
+    assert len(calls) == 3
+
+
+def test_read_csv_pads_ragged_rows():
+    """Test short rows are padded with '' and unknown columns are dropped"""
+    ragged_csv = "Opportunity ID,phone,Lead Value,Notes\nopp_1,0555123456,100,extra\nopp_2,7075675820\n"
+
+    df = MasterChildOpportunityUpdateService._read_csv(ragged_csv)
+
+    assert df.to_dict('records') == [
+        {'Opportunity ID': 'opp_1', 'phone': '0555123456', 'Lead Value': '100'},
+        {'Opportunity ID': 'opp_2', 'phone': '7075675820', 'Lead Value': ''},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('threshold', [0.3, 0.6, 0.7, 0.85])
+async def test_perform_matching_agrees_with_scalar_scoring(threshold):
+    """Test vectorized matching picks the same pairs and scores as greedy _calculate_match_score in child order"""
+    service = MasterChildOpportunityUpdateService()
+    parsed = service.parse_csv_files(MASTER_CSV, CHILD_CSV)
+    masters, children = parsed['master_opportunities'], parsed['child_opportunities']
+
+    taken = set()
+    expected, expected_scores = [], []
+    for child in children:
+        best_score, best_master = 0.0, None
+        for master in masters:
+            if master['opportunity_id'] in taken:
+                continue
+            score = service._calculate_match_score(master, child)
+            if score >= threshold and score > best_score:
+                best_score, best_master = score, master
+        if best_master:
+            taken.add(best_master['opportunity_id'])
+        expected.append((child['opportunity_id'], (best_master or {}).get('opportunity_id'), (best_master or {}).get('row_number')))
+        expected_scores.append(best_score)
+
+    service.matching_tracker = OrderedDict()
+    service._track(service.matching_tracker, 'test', {
+        'processed': 0, 'matches_found': 0, 'exact_matches': 0, 'fuzzy_matches': 0, 'no_matches': 0
+    })
+    await service._perform_matching('test', masters, children, threshold, 0.9)
+    matches = service.matching_tracker['test']['matches']
+
+    got = [
+        (m['child_opportunity']['opportunity_id'],
+         (m['master_opportunity'] or {}).get('opportunity_id'),
+         (m['master_opportunity'] or {}).get('row_number'))
+        for m in matches
+    ]
+    assert got == expected
+    assert [m['match_score'] for m in matches] == pytest.approx(expected_scores)